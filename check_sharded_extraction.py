@@ -0,0 +1,139 @@
+# check_sharded_extraction.py
+# Local check of coordinator/worker extraction: a fake scc on PATH, a generated git repository and several
+# worker processes on this machine, one of them killed while it holds a lease
+import os
+import sys
+import time
+import json
+import shutil
+import signal
+import sqlite3
+import tempfile
+import subprocess
+import argparse
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+EXTRACTOR = os.path.join(BASE_DIR, 'extract_scc_history.py')
+
+# Counts non-empty lines as code and `if` occurrences as complexity; sleeps to keep leases busy
+FAKE_SCC = '''import os, sys, json, time
+time.sleep(float(os.environ.get('FAKE_SCC_DELAY', '0')))
+langs = {}
+for target in [a for a in sys.argv[1:] if not a.startswith('-') and a != 'json']:
+    for root, _, names in os.walk(target):
+        for name in names:
+            if not name.endswith('.dart'):
+                continue
+            path = os.path.join(root, name)
+            with open(path, encoding='utf-8') as f:
+                lines = [l for l in f.read().splitlines() if l.strip()]
+            langs.setdefault('Dart', []).append({
+                'Language': 'Dart', 'Location': path, 'Filename': name, 'Lines': len(lines), 'Code': len(lines),
+                'Comment': 0, 'Blank': 0, 'Complexity': sum(l.count('if') for l in lines),
+                'Bytes': os.path.getsize(path)})
+report = []
+for name, files in langs.items():
+    lang = {'Name': name, 'Count': len(files), 'Files': files}
+    for field in ('Lines', 'Code', 'Comment', 'Blank', 'Complexity', 'Bytes'):
+        lang[field] = sum(f[field] for f in files)
+    report.append(lang)
+print(json.dumps(report))
+'''
+
+
+def make_repository(path, commits):
+    """Create a repository with one commit per day, each appending a line to one of a few files."""
+    git = ['git', '-c', 'user.name=check', '-c', 'user.email=check@example.com']
+    subprocess.run(['git', 'init', '-q', '-b', 'main', path], check=True)
+    for i in range(commits):
+        rel = ['lib/core/core.dart', 'lib/features/auth/auth.dart', 'lib/main.dart'][i % 3]
+        full = os.path.join(path, rel)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, 'a', encoding='utf-8') as f:
+            f.write(f'if (x == {i}) {{ y(); }}\n')
+        # Distinct dates: reports are named after the commit date (2026-01-01 + i days)
+        date = f'{1767225600 + i * 86400} +0000'
+        subprocess.run(['git', 'add', '-A'], cwd=path, check=True)
+        env = dict(os.environ, GIT_COMMITTER_DATE=date, GIT_AUTHOR_DATE=date)
+        subprocess.run(git + ['commit', '-q', '-m', f'commit {i}'], cwd=path, env=env, check=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run sharded extraction with several local workers and check the result.')
+    parser.add_argument('--workers', type=int, default=3, help='Workers started after the killed one (default: 3)')
+    parser.add_argument('--commits', type=int, default=24, help='Commits of the generated repository (default: 24)')
+    parser.add_argument('--shard-size', type=int, default=4, help='Commits per shard (default: 4)')
+    parser.add_argument('--keep', action='store_true', help='Keep the temporary folder for inspection')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='scc_check_')
+    try:
+        bin_dir = os.path.join(work_dir, 'bin')
+        os.makedirs(bin_dir)
+        scc_path = os.path.join(bin_dir, 'scc')
+        with open(scc_path, 'w', encoding='utf-8') as f:
+            f.write(f'#!{sys.executable}\n' + FAKE_SCC)
+        os.chmod(scc_path, 0o755)
+
+        repo_dir = os.path.join(work_dir, 'repo')
+        report_dir = os.path.join(work_dir, 'reports')
+        queue_path = os.path.join(work_dir, 'queue.sqlite')
+        make_repository(repo_dir, args.commits)
+        os.makedirs(report_dir)
+
+        env = dict(os.environ, PATH=bin_dir + os.pathsep + os.environ.get('PATH', ''), REPO_URL=repo_dir,
+                   REPORT_DIR=report_dir, BRANCH='main', SCC_TARGET='lib/', FAKE_SCC_DELAY='0.3')
+        common = [sys.executable, EXTRACTOR, '--queue', queue_path]
+        subprocess.run(common + ['--coordinator', '--branch', 'main', '--shard-size', str(args.shard_size)],
+                       env=env, check=True, stdout=subprocess.DEVNULL)
+
+        # First worker: killed once it has analyzed a commit, i.e. in the middle of its shard
+        lease = ['--lease-seconds', '3']
+        victim = subprocess.Popen(common + ['--worker', '--worker-id', 'victim'] + lease, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        victim_journal = os.path.join(report_dir, 'extract_journal.victim.jsonl')
+        deadline = time.time() + 60
+        while not (os.path.exists(victim_journal) and os.path.getsize(victim_journal)):
+            if time.time() > deadline or victim.poll() is not None:
+                raise SystemExit('❌ The first worker did not start analyzing')
+            time.sleep(0.05)
+        victim.send_signal(signal.SIGKILL)
+        victim.wait()
+        print('Killed worker "victim" while it held a lease')
+
+        workers = [subprocess.Popen(common + ['--worker', '--worker-id', f'w{i}'] + lease, env=env,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                   for i in range(args.workers)]
+        codes = [w.wait(timeout=600) for w in workers]
+
+        conn = sqlite3.connect(queue_path)
+        shards = conn.execute('SELECT id, status, worker, attempts FROM shards ORDER BY id').fetchall()
+        conn.close()
+        reports = [f for f in os.listdir(report_dir) if f.startswith('scc_') and f.endswith('_summary.txt')]
+        problems = []
+        if any(codes):
+            problems.append(f'worker exit codes {codes}')
+        if any(status != 'done' for _, status, _, _ in shards):
+            problems.append(f'unfinished shards {shards}')
+        if not any(attempts for _, _, worker, attempts in shards if worker != 'victim'):
+            problems.append('the killed worker\'s lease was not handed to another worker')
+        if len(reports) != args.commits:
+            problems.append(f'{len(reports)} reports for {args.commits} commits')
+        newest = json.load(open(os.path.join(report_dir, 'latest_files.json'), encoding='utf-8'))
+        if sum(v['Code'] for v in newest.values()) != args.commits:
+            problems.append('latest_files.json does not match the newest commit')
+
+        print(f'Shards: {len(shards)}, reports: {len(reports)}, workers: {args.workers} (+1 killed)')
+        if problems:
+            print('❌ ' + '\n❌ '.join(problems))
+            sys.exit(1)
+        print('✅ Sharded extraction completed, the expired lease was taken over')
+    finally:
+        if args.keep:
+            print(f'Kept {work_dir}')
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
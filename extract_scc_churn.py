@@ -0,0 +1,208 @@
+# extract_scc_churn.py
+# Checkout-free churn extraction: one streaming `git log --numstat --first-parent` pass (no working tree needed)
+import os
+import io
+import csv
+import json
+import shutil
+import subprocess
+import tempfile
+import argparse
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+from scc_modules import SCC_TARGET
+from scc_storage import atomic_write_text
+
+CHURN_COMMITS_FILE = 'churn_commits.csv'
+CHURN_FILES_FILE = 'churn_files.csv'
+# Per-file scc totals of the newest analyzed commit (written by extract_scc_history.py)
+LATEST_FILES_FILE = 'latest_files.json'
+LATEST_FILES_FIELDS = ('Code', 'Complexity', 'Lines', 'Comment', 'Blank')
+# Window used for the "recent" churn columns (hotspots favour files that are still moving)
+CHURN_RECENT_DAYS = int(os.getenv('CHURN_RECENT_DAYS', '90'))
+
+COMMIT_MARKER = '\x00'
+
+
+def _parse_numstat_path(path):
+    """Return (old_path, new_path) for a numstat path; old_path is None when the file was not renamed.
+    Handles both `old => new` and `dir/{old => new}/file` notations."""
+    if ' => ' not in path:
+        return None, path
+    if '{' in path and '}' in path:
+        pre, rest = path.split('{', 1)
+        mid, post = rest.split('}', 1)
+        old_mid, new_mid = mid.split(' => ', 1)
+        old = (pre + old_mid + post).replace('//', '/')
+        new = (pre + new_mid + post).replace('//', '/')
+        return old, new
+    old, new = path.split(' => ', 1)
+    return old, new
+
+
+def iter_numstat(repo_dir, ref='HEAD', paths=None):
+    """Stream (sha, commit_date, [(added, deleted, old_path, new_path), ...]) newest first.
+    Binary files are reported with 0 added/deleted lines. Merges are diffed against their first parent
+    (explicit `-m`: git < 2.31 shows no diff for merges by default, which would count merged PRs as zero churn).
+    Stopping the iteration early is not an error."""
+    cmd = ['git', '-c', 'core.quotepath=off', 'log', '--first-parent', '-m', '--numstat', '--no-color',
+           '--format=%x00%H%x09%cI', ref, '--']
+    cmd += paths or []
+    proc = subprocess.Popen(cmd, cwd=repo_dir, stdout=subprocess.PIPE, text=True, encoding='utf-8',
+                            errors='replace', bufsize=1 << 16)
+    sha = date = None
+    changes = []
+    completed = False
+    try:
+        for line in proc.stdout:
+            if line.startswith(COMMIT_MARKER):
+                if sha:
+                    yield sha, date, changes
+                sha, date = line[1:].rstrip('\n').split('\t', 1)
+                changes = []
+                continue
+            line = line.rstrip('\n')
+            if not line:
+                continue
+            parts = line.split('\t', 2)
+            if len(parts) != 3:
+                continue
+            added = int(parts[0]) if parts[0] != '-' else 0
+            deleted = int(parts[1]) if parts[1] != '-' else 0
+            old, new = _parse_numstat_path(parts[2])
+            changes.append((added, deleted, old, new))
+        if sha:
+            yield sha, date, changes
+        completed = True
+    finally:
+        proc.stdout.close()
+        # A consumer that stops early closes the pipe: git then dies of SIGPIPE, which is expected
+        if proc.wait() != 0 and completed:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def collect_churn(repo_dir, ref='HEAD', paths=None, recent_days=CHURN_RECENT_DAYS):
+    """Aggregate per-commit and per-file churn in a single pass.
+    Renames are followed so older history is attributed to the file's current path."""
+    commits = []
+    files = {}
+    aliases = {}
+    recent_since = datetime.now(timezone.utc) - timedelta(days=recent_days)
+    for sha, date, changes in iter_numstat(repo_dir, ref, paths):
+        is_recent = datetime.fromisoformat(date) >= recent_since
+        added_total = deleted_total = 0
+        for added, deleted, old, new in changes:
+            current = aliases.get(new, new)
+            if old and old != new:
+                # Walking newest to oldest: older commits refer to `old`, which is now `current`
+                aliases[old] = current
+            stats = files.setdefault(current, {
+                'added': 0, 'deleted': 0, 'commits': 0,
+                'recent_added': 0, 'recent_deleted': 0, 'recent_commits': 0, 'last_date': date
+            })
+            stats['added'] += added
+            stats['deleted'] += deleted
+            stats['commits'] += 1
+            if is_recent:
+                stats['recent_added'] += added
+                stats['recent_deleted'] += deleted
+                stats['recent_commits'] += 1
+            added_total += added
+            deleted_total += deleted
+        commits.append({'sha': sha, 'date': date, 'added': added_total, 'deleted': deleted_total,
+                        'files': len(changes)})
+    return commits, files
+
+
+def write_churn(output_dir, commits, files):
+    """Write churn_commits.csv (one row per commit) and churn_files.csv (one row per file) to `output_dir`."""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(['sha', 'date', 'added', 'deleted', 'files'])
+    for c in commits:
+        writer.writerow([c['sha'], c['date'], c['added'], c['deleted'], c['files']])
+    commits_path = os.path.join(output_dir, CHURN_COMMITS_FILE)
+    atomic_write_text(commits_path, out.getvalue())
+
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(['path', 'added', 'deleted', 'commits', 'recent_added', 'recent_deleted',
+                     'recent_commits', 'last_date'])
+    for path, s in sorted(files.items(), key=lambda kv: kv[1]['added'] + kv[1]['deleted'], reverse=True):
+        writer.writerow([path, s['added'], s['deleted'], s['commits'], s['recent_added'],
+                         s['recent_deleted'], s['recent_commits'], s['last_date']])
+    files_path = os.path.join(output_dir, CHURN_FILES_FILE)
+    atomic_write_text(files_path, out.getvalue())
+    return commits_path, files_path
+
+
+def load_file_churn(report_dir):
+    """Load churn_files.csv as {path: stats}; empty dict when churn was never extracted."""
+    path = os.path.join(report_dir, CHURN_FILES_FILE)
+    if not os.path.exists(path):
+        return {}
+    files = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            files[row['path']] = {k: (v if k in ('path', 'last_date') else int(v)) for k, v in row.items()}
+    return files
+
+
+def compute_hotspots(report_dir, top=10):
+    """Rank files by recent churn x complexity of the newest analyzed commit.
+    Returns a list of (path, score, churn, commits, complexity, code)."""
+    churn = load_file_churn(report_dir)
+    latest_path = os.path.join(report_dir, LATEST_FILES_FILE)
+    if not churn or not os.path.exists(latest_path):
+        return []
+    with open(latest_path, 'r', encoding='utf-8') as f:
+        latest = json.load(f)
+    hotspots = []
+    for path, totals in latest.items():
+        stats = churn.get(path)
+        if not stats:
+            continue
+        recent_churn = stats['recent_added'] + stats['recent_deleted']
+        score = recent_churn * totals.get('Complexity', 0)
+        if score > 0:
+            hotspots.append((path, score, recent_churn, stats['recent_commits'],
+                             totals.get('Complexity', 0), totals.get('Code', 0)))
+    hotspots.sort(key=lambda h: h[1], reverse=True)
+    return hotspots[:top]
+
+
+def extract_churn(repo_dir, ref, output_dir, paths=None):
+    """Run the churn pass on `repo_dir` and store the results in `output_dir`."""
+    commits, files = collect_churn(repo_dir, ref, paths if paths is not None else [SCC_TARGET])
+    write_churn(output_dir, commits, files)
+    print(f"Churn: {len(commits)} commits, {len(files)} files -> {output_dir}")
+    return commits, files
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Extract per-commit and per-file churn without checking out commits.')
+    parser.add_argument('--repo', help='Local clone to analyze (default: bare clone of REPO_URL in a temporary folder)')
+    parser.add_argument('--branch', '-b', help='Branch or ref to analyze (default: BRANCH from .env, HEAD with --repo)')
+    args = parser.parse_args()
+
+    output_dir = os.path.abspath(os.getenv('REPORT_DIR', 'scc_reports'))
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    if args.repo:
+        extract_churn(args.repo, args.branch or 'HEAD', output_dir)
+    else:
+        repo_url = os.getenv('REPO_URL')
+        if not repo_url:
+            raise ValueError('REPO_URL must be set in .env file (or use --repo)')
+        branch = args.branch or os.getenv('BRANCH', 'main')
+        temp_dir = tempfile.mkdtemp(prefix='scc_churn_')
+        try:
+            subprocess.run(['git', 'clone', '--bare', '--single-branch', '--branch', branch, repo_url, temp_dir], check=True)
+            extract_churn(temp_dir, branch, output_dir)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
@@ -8,11 +8,30 @@ import json
 import re
 import argparse
 import sys
+import time
+import socket
+from datetime import datetime
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+from scc_modules import SCC_TARGET, load_module_prefixes, aggregate_by_module, strip_file_details, report_paths, file_totals
+from extract_scc_churn import LATEST_FILES_FILE, LATEST_FILES_FIELDS, extract_churn
+from scc_storage import PLAN_FILE, ExtractionJournal, atomic_write_json, atomic_write_text, load_json, remove_stale_temp_files
+from scc_queue import DEFAULT_LEASE_SECONDS, WorkQueue
+from scc_batch import analyze_batch, cocomo_summary
+
+# Failed commits are retried on later runs until they reach this number of attempts
+MAX_ATTEMPTS = int(os.getenv('EXTRACT_MAX_ATTEMPTS', '3'))
+# Commits counted per scc process (1 = check out and analyze each commit on its own)
+BATCH_SIZE = int(os.getenv('EXTRACT_BATCH_SIZE', '1'))
+# Per-run limits (empty = no limit), e.g. EXTRACT_TIME_BUDGET=45m for a cron job
+TIME_BUDGET = os.getenv('EXTRACT_TIME_BUDGET', '')
+MAX_COMMITS = os.getenv('EXTRACT_MAX_COMMITS', '')
+# The newest commits are analyzed densely; older history is sampled every 2, 4, 8... commits first
+DENSE_COMMITS = 100
+
 def load_config():
     """Load configuration from environment variables."""
     config = {
@@ -70,63 +89,347 @@ def select_latest_version_branch(repo_url):
     except Exception:
         return None
 
-parser = argparse.ArgumentParser(description='Extract SCC history from a repo (with branch auto-detect).')
-parser.add_argument('--branch', '-b', help='Branch to analyze (overrides auto-detection)')
-args = parser.parse_args()
-
-# Determine branch: CLI override > auto-detected highest v* branch > config BRANCH > 'main'
-if args.branch:
-    BRANCH = args.branch
-else:
+def resolve_branch(cli_branch):
+    """Determine branch: CLI override > auto-detected highest v* branch > config BRANCH > 'main'"""
+    if cli_branch:
+        return cli_branch
     detected = select_latest_version_branch(config.get('REPO_URL'))
     if detected:
-        BRANCH = detected
-    else:
-        BRANCH = config.get('BRANCH') if config.get('BRANCH') else 'main'
-
-OUTPUT_DIR = os.path.abspath(config.get('REPORT_DIR', 'scc_reports'))
-
-if not os.path.exists(OUTPUT_DIR):
-    os.makedirs(OUTPUT_DIR)
-
-# Use a temporary folder for cloning
-temp_dir = tempfile.mkdtemp(prefix='scc_temp_')
-print(f"Cloning repository to {temp_dir} ...")
-
-try:
-    subprocess.run([
-        'git', 'clone', '--no-checkout', '--branch', BRANCH, REPO_URL, temp_dir
-    ], check=True)
-
-    os.chdir(temp_dir)
-    # List of commits (from most recent to oldest)
-    result = subprocess.run(['git', 'rev-list', BRANCH], capture_output=True, text=True, check=True)
-    commits = result.stdout.strip().split('\n')
-
-    for commit in commits:
-        # Get commit date
-        date_result = subprocess.run([
-            'git', 'show', '-s', '--format=%ci', commit
-        ], capture_output=True, text=True, check=True)
-        commit_date = date_result.stdout.strip()
-        # Clean formatting for filename
-        commit_date_fmt = commit_date.replace(' ', '_').replace(':', '-').replace('/', '-').replace('.', '-')
-        report_file = os.path.join(OUTPUT_DIR, f'scc_{commit_date_fmt}.json')
-        summary_file = os.path.join(OUTPUT_DIR, f'scc_{commit_date_fmt}_summary.txt')
-
-        if os.path.exists(report_file):
-            print(f"Commit {commit} from {commit_date_fmt} already analyzed. Skipping.")
+        return detected
+    return config.get('BRANCH') if config.get('BRANCH') else 'main'
+
+def list_commits(repo_dir, ref):
+    """Return [(sha, commit_date)] from most recent to oldest with a single git call."""
+    result = subprocess.run(['git', 'log', '--format=%H%x09%ci', ref], cwd=repo_dir, capture_output=True, text=True, check=True)
+    return [tuple(line.split('\t', 1)) for line in result.stdout.splitlines() if line.strip()]
+
+def is_analyzed(journal, sha, paths):
+    """True when the commit's reports are complete.
+    Reports written before the journal existed are accepted only if their JSON files parse."""
+    if not all(os.path.exists(p) for p in paths.values()):
+        return False
+    if journal.is_done(sha):
+        return True
+    return load_json(paths['report']) is not None and load_json(paths['modules']) is not None
+
+def parse_duration(value):
+    """Seconds of a duration like '3600', '90s', '45m', '2h' or '1h30m'; None when empty.
+    Used as an argparse type: invalid values are reported as usage errors."""
+    value = str(value or '').strip().lower()
+    if not value:
+        return None
+    if re.fullmatch(r'\d+(\.\d+)?', value):
+        return float(value)
+    parts = re.findall(r'(\d+(?:\.\d+)?)([hms])', value)
+    if not parts or ''.join(n + u for n, u in parts) != value:
+        raise argparse.ArgumentTypeError(f"invalid duration '{value}' (expected e.g. 3600, 90s, 45m, 2h or 1h30m)")
+    units = {'s': 1, 'm': 60, 'h': 3600}
+    return sum(float(n) * units[u] for n, u in parts)
+
+def schedule_commits(commits, is_done, dense=DENSE_COMMITS):
+    """Order commits (newest first) for budgeted runs:
+    1. commits newer than the newest analyzed one, newest first;
+    2. the rest by density deficit: the `dense` newest commits all count, the next 2*dense every 2nd commit,
+       the next 4*dense every 4th, and so on; commits beyond that profile come after, coarsest gaps first.
+    Sampling points are counted from the root commit, so they stay the same as history grows."""
+    n = len(commits)
+    head = next((i for i, (sha, date) in enumerate(commits) if is_done(sha, date)), n)
+
+    def deficit(i):
+        tier = (i // dense + 1).bit_length() - 1
+        j = n - 1 - i
+        # Power of two dividing the position from the root (the root commit is a sampling point of every level)
+        level = (j & -j).bit_length() - 1 if j else tier
+        return max(0, tier - level)
+
+    order = sorted(range(n), key=lambda i: (i >= head, deficit(i) if i >= head else 0, i))
+    return [commits[i] for i in order]
+
+def describe_error(e):
+    """Short, journal-friendly reason for a failed commit."""
+    if isinstance(e, subprocess.CalledProcessError):
+        stderr = (e.stderr or '').strip() if isinstance(e.stderr, str) else ''
+        return f"{' '.join(str(c) for c in e.cmd)} exited with {e.returncode}" + (f": {stderr[-300:]}" if stderr else '')
+    return f"{type(e).__name__}: {e}"
+
+def write_reports(paths, by_file, summary, module_prefixes, latest_files_path=None):
+    """Write the reports of one commit. Every file goes through temp file + rename,
+    and the language report is written last: its presence means the commit is complete."""
+    atomic_write_json(paths['modules'], aggregate_by_module(by_file, module_prefixes), compact=True)
+    atomic_write_text(paths['summary'], summary)
+    if latest_files_path:
+        # Per-file totals of the newest commit feed the hotspot ranking (churn x complexity)
+        atomic_write_json(latest_files_path, file_totals(by_file, LATEST_FILES_FIELDS), compact=True)
+    atomic_write_json(paths['report'], strip_file_details(by_file))
+
+def analyze_commit(repo_dir, sha, paths, module_prefixes, latest_files_path=None):
+    """Check out `sha` and write its reports."""
+    subprocess.run(['git', 'checkout', '--quiet', '--force', sha], cwd=repo_dir, capture_output=True, text=True, check=True)
+    # Run scc once per file, then aggregate per language and per module (and the COCOMO summary) in-process
+    scc_result = subprocess.run(['scc', '--by-file', '--format', 'json', SCC_TARGET], cwd=repo_dir, capture_output=True, text=True, check=True)
+    by_file = json.loads(scc_result.stdout or '[]') or []
+    write_reports(paths, by_file, cocomo_summary(by_file), module_prefixes, latest_files_path)
+
+def run_extraction(repo_dir, commits, output_dir, journal, max_attempts=MAX_ATTEMPTS, newest_sha=None, keep_going=None,
+                   batch_size=BATCH_SIZE, max_commits=None):
+    """Analyze every commit not yet analyzed (at most `max_commits`), recording each outcome in the journal.
+    `newest_sha` defaults to the first commit; `keep_going()` is checked before each commit or batch
+    (lease renewal, time budget).
+    With `batch_size` > 1, commits are exported side by side and counted `batch_size` at a time by one scc process;
+    the commits of a failed batch are retried one by one, so a bad commit only fails itself.
+    Returns the commits that still failed (sha -> reason)."""
+    module_prefixes = load_module_prefixes()
+    latest_files_path = os.path.join(output_dir, LATEST_FILES_FILE)
+    if newest_sha is None and commits:
+        newest_sha = commits[0][0]
+    failed = {}
+    total = len(commits)
+
+    todo = []
+    for index, (commit, commit_date) in enumerate(commits, start=1):
+        paths = report_paths(output_dir, commit_date)
+        is_newest = commit == newest_sha
+        latest_missing = is_newest and not os.path.exists(latest_files_path)
+        if is_analyzed(journal, commit, paths) and not latest_missing:
+            continue
+        if journal.failed_attempts(commit) >= max_attempts:
+            failed[commit] = journal.entries[commit]['error']
+            continue
+        todo.append((index, commit, commit_date, paths, latest_files_path if is_newest else None))
+    if max_commits is not None:
+        todo = todo[:max_commits]
+
+    def analyze_one(index, commit, commit_date, paths, latest_path):
+        attempts = journal.failed_attempts(commit)
+        print(f"[{index}/{total}] Analyzing {commit} from {commit_date} ...")
+        try:
+            analyze_commit(repo_dir, commit, paths, module_prefixes, latest_path)
+        except (subprocess.CalledProcessError, ValueError, OSError) as e:
+            reason = describe_error(e)
+            print(f"⚠ Commit {commit} failed (attempt {attempts + 1}/{max_attempts}): {reason}")
+            journal.mark_failed(commit, reason, commit_date)
+            failed[commit] = reason
+            return
+        journal.mark_done(commit, commit_date)
+
+    step = max(1, batch_size)
+    for start in range(0, len(todo), step):
+        if keep_going and not keep_going():
+            print("⚠ Stopping early (lease lost or time budget used).")
+            break
+        batch = todo[start:start + step]
+        if len(batch) == 1:
+            analyze_one(*batch[0])
+            continue
+        print(f"[{batch[0][0]}-{batch[-1][0]}/{total}] Analyzing {len(batch)} commits in one scc run ...")
+        try:
+            reports = analyze_batch(repo_dir, [item[1] for item in batch], SCC_TARGET)
+        except (subprocess.CalledProcessError, ValueError, OSError) as e:
+            print(f"⚠ Batch failed ({describe_error(e)}): analyzing its commits one by one.")
+            for item in batch:
+                analyze_one(*item)
             continue
-        print(f"Analyzing {commit} from {commit_date_fmt} ...")
-        subprocess.run(['git', 'checkout', '--quiet', commit], check=True)
-        # Run scc
-        with open(report_file, 'w', encoding='utf-8') as f_json:
-            subprocess.run(['scc', '--format', 'json', 'lib/'], stdout=f_json, check=True)
-        with open(summary_file, 'w', encoding='utf-8') as f_txt:
-            subprocess.run(['scc', 'lib/'], stdout=f_txt, check=True)
-finally:
-    os.chdir(os.path.dirname(__file__))
+        for index, commit, commit_date, paths, latest_path in batch:
+            by_file = reports[commit]
+            try:
+                write_reports(paths, by_file, cocomo_summary(by_file), module_prefixes, latest_path)
+            except (ValueError, OSError) as e:
+                reason = describe_error(e)
+                print(f"⚠ Commit {commit} failed (attempt {journal.failed_attempts(commit) + 1}/{max_attempts}): {reason}")
+                journal.mark_failed(commit, reason, commit_date)
+                failed[commit] = reason
+                continue
+            journal.mark_done(commit, commit_date)
+    return failed
+
+def clone_repository(repo_url, branch):
+    """Clone `branch` without checkout into a new temporary folder and return its path."""
+    # Use a temporary folder for cloning
+    temp_dir = tempfile.mkdtemp(prefix='scc_temp_')
+    print(f"Cloning repository to {temp_dir} ...")
+    try:
+        subprocess.run(['git', 'clone', '--no-checkout', '--branch', branch, repo_url, temp_dir], check=True)
+    except BaseException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    return temp_dir
+
+def prepare_clone(branch, output_dir, commits=None):
+    """Clone `branch`, list its commits (newest first) unless `commits` is given, and refresh churn.
+    Returns (clone_dir, commits); the caller removes clone_dir."""
+    temp_dir = clone_repository(REPO_URL, branch)
+    try:
+        if commits is None:
+            commits = list_commits(temp_dir, branch)
+        # Churn needs no checkout: one streaming `git log --numstat` pass over the whole history
+        extract_churn(temp_dir, branch, output_dir)
+    except BaseException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    return temp_dir, commits
+
+def default_worker_id():
+    """Host + PID, safe to use in a file name."""
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', f"{socket.gethostname()}-{os.getpid()}")
+
+def run_coordinator(queue_path, branch, output_dir, shard_size, max_attempts=MAX_ATTEMPTS):
+    """Split the commits still to analyze into shards of the shared queue (idempotent, can be re-run)."""
+    queue = WorkQueue(queue_path)
+    journal = ExtractionJournal(output_dir)
+    temp_dir, commits = prepare_clone(branch, output_dir)
     print(f"Removing temporary folder {temp_dir} ...")
     shutil.rmtree(temp_dir, ignore_errors=True)
 
-print(f"Analysis complete. Reports are in: {OUTPUT_DIR}")
+    latest_missing = not os.path.exists(os.path.join(output_dir, LATEST_FILES_FILE))
+    analyzed = lambda sha, date: is_analyzed(journal, sha, report_paths(output_dir, date))
+    newest = commits[0][0] if commits else None
+    # Shards are claimed in queue order: newest commits first, then history from coarse to fine
+    todo = [
+        (sha, date) for sha, date in schedule_commits(commits, analyzed)
+        if (not analyzed(sha, date) or (sha == newest and latest_missing))
+        and journal.failed_attempts(sha) < max_attempts
+    ]
+    queue.set_meta('repo_url', REPO_URL)
+    queue.set_meta('branch', branch)
+    queue.set_meta('newest', newest)
+    queue.requeue_expired()
+    added = queue.enqueue(todo, shard_size)
+    print(f"Queue {queue_path}: {len(todo)} commit(s) to analyze, {added} new shard(s). Progress: {queue.progress()}")
+    queue.close()
+
+def run_worker(queue_path, output_dir, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS, max_attempts=MAX_ATTEMPTS,
+               batch_size=BATCH_SIZE):
+    """Claim shards from the shared queue until none is left. Reports are written atomically and named after
+    the commit date, so a shard analyzed twice (expired lease) simply rewrites identical files."""
+    queue = WorkQueue(queue_path)
+    branch = queue.get_meta('branch')
+    if not branch:
+        print(f"Queue {queue_path} is empty: run the coordinator first (--coordinator).")
+        return
+    repo_url = queue.get_meta('repo_url', REPO_URL)
+    newest = queue.get_meta('newest')
+    journal = ExtractionJournal(output_dir, worker=worker_id)
+    temp_dir = clone_repository(repo_url, branch)
+    try:
+        while True:
+            claimed = queue.claim(worker_id, lease_seconds)
+            if not claimed:
+                if queue.progress().get('leased'):
+                    # Other workers are busy: wait in case one of their leases expires
+                    time.sleep(min(30, max(1, lease_seconds / 4)))
+                    continue
+                break
+            shard_id, commits = claimed
+            print(f"Worker {worker_id}: shard {shard_id} ({len(commits)} commits)")
+            journal.reload()
+            try:
+                failed = run_extraction(temp_dir, commits, output_dir, journal, max_attempts, newest_sha=newest,
+                                        keep_going=lambda: queue.renew(shard_id, worker_id, lease_seconds),
+                                        batch_size=batch_size)
+            except Exception as e:
+                queue.release(shard_id, worker_id, describe_error(e))
+                raise
+            error = '; '.join(f"{sha[:10]}: {reason}" for sha, reason in failed.items())[:2000] or None
+            queue.complete(shard_id, worker_id, error)
+    finally:
+        print(f"Removing temporary folder {temp_dir} ...")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        queue.close()
+    print(f"Worker {worker_id}: no shard left.")
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract SCC history from a repo (with branch auto-detect).')
+    parser.add_argument('--branch', '-b', help='Branch to analyze (overrides auto-detection)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Resume an interrupted extraction from its saved commit plan and journal')
+    parser.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS,
+                        help=f'Attempts per commit before giving up on it (default: {MAX_ATTEMPTS})')
+    # String defaults go through `type` too, so invalid environment values are reported as usage errors
+    parser.add_argument('--time-budget', type=parse_duration, default=TIME_BUDGET or None,
+                        help='Stop starting new commits after this duration, e.g. 45m, 2h or 1h30m (default: EXTRACT_TIME_BUDGET)')
+    parser.add_argument('--max-commits', type=int, default=MAX_COMMITS or None,
+                        help='Analyze at most this many commits per run (default: EXTRACT_MAX_COMMITS)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help=f'Commits counted per scc process; > 1 exports trees instead of checking out (default: {BATCH_SIZE})')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--coordinator', action='store_true', help='Split the commits to analyze into shards of the shared queue')
+    mode.add_argument('--worker', action='store_true', help='Claim and analyze shards from the shared queue')
+    parser.add_argument('--queue', default=os.getenv('EXTRACT_QUEUE'),
+                        help='SQLite queue file on shared storage (default: EXTRACT_QUEUE or <REPORT_DIR>/extract_queue.sqlite)')
+    parser.add_argument('--shard-size', type=int, default=50, help='Commits per shard (coordinator, default: 50)')
+    parser.add_argument('--lease-seconds', type=int, default=DEFAULT_LEASE_SECONDS,
+                        help=f'Shard lease duration, renewed after each commit (worker, default: {DEFAULT_LEASE_SECONDS})')
+    parser.add_argument('--worker-id', default=default_worker_id(), help='Worker name (default: <host>-<pid>)')
+    args = parser.parse_args()
+    started = time.time()
+
+    output_dir = os.path.abspath(config.get('REPORT_DIR', 'scc_reports'))
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    # Leftovers of writes interrupted before their rename
+    remove_stale_temp_files(output_dir)
+
+    queue_path = args.queue or os.path.join(output_dir, 'extract_queue.sqlite')
+    if args.coordinator:
+        run_coordinator(queue_path, resolve_branch(args.branch), output_dir, args.shard_size, args.max_attempts)
+        return
+    if args.worker:
+        run_worker(queue_path, output_dir, args.worker_id, args.lease_seconds, args.max_attempts, args.batch_size)
+        return
+
+    journal = ExtractionJournal(output_dir)
+    plan_path = os.path.join(output_dir, PLAN_FILE)
+    plan = load_json(plan_path) if args.resume else None
+    if args.resume and not plan:
+        print("No interrupted extraction to resume: starting a new one.")
+    branch = plan['branch'] if plan else resolve_branch(args.branch)
+
+    temp_dir, commits = prepare_clone(branch, output_dir, [tuple(c) for c in plan['commits']] if plan else None)
+    try:
+        if plan:
+            done = sum(1 for sha, _ in commits if journal.is_done(sha))
+            print(f"Resuming extraction of {branch}: {done}/{len(commits)} commits already done.")
+        else:
+            # List of commits (from most recent to oldest), saved so an interrupted run can be resumed
+            atomic_write_json(plan_path, {'branch': branch, 'created': datetime.now().isoformat(timespec='seconds'),
+                                          'commits': commits}, compact=True)
+
+        budget = args.time_budget
+        keep_going = None
+        if budget is not None:
+            keep_going = lambda: time.time() - started < budget
+        if budget is not None or args.max_commits is not None:
+            # Bounded run: newest commits first, then older history at decreasing density (continued by later runs)
+            analyzed = lambda sha, date: is_analyzed(journal, sha, report_paths(output_dir, date))
+            ordered = schedule_commits(commits, analyzed)
+        else:
+            ordered = commits
+
+        failed = run_extraction(temp_dir, ordered, output_dir, journal, args.max_attempts,
+                                newest_sha=commits[0][0] if commits else None, keep_going=keep_going,
+                                batch_size=args.batch_size, max_commits=args.max_commits)
+    finally:
+        print(f"Removing temporary folder {temp_dir} ...")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    # Failed commits not attempted this run (time budget, max commits) are reported once, as failures
+    listed = {sha for sha, _ in commits}
+    for sha, entry in journal.failures().items():
+        if sha in listed and sha not in failed:
+            failed[sha] = entry['error']
+    retryable = {sha: reason for sha, reason in failed.items() if journal.failed_attempts(sha) < args.max_attempts}
+    remaining = [sha for sha, date in commits
+                 if not is_analyzed(journal, sha, report_paths(output_dir, date)) and sha not in failed]
+    if remaining:
+        print(f"⏳ {len(remaining)} of {len(commits)} commit(s) left for later runs.")
+    if not retryable and not remaining and os.path.exists(plan_path):
+        # Nothing left to resume
+        os.remove(plan_path)
+    if failed:
+        print(f"⚠ {len(failed)} commit(s) failed ({len(retryable)} will be retried on the next run):")
+        for sha, reason in list(failed.items())[:20]:
+            print(f"  {sha[:10]} {reason}")
+    print(f"Analysis complete. Reports are in: {output_dir}")
+
+if __name__ == '__main__':
+    main()
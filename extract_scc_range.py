@@ -0,0 +1,210 @@
+# extract_scc_range.py
+# PR/range delta: measure only the files changed between two commits of a local clone (no checkout, no network)
+import os
+import json
+import shutil
+import tempfile
+import subprocess
+import argparse
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+from scc_modules import (SCC_TARGET, SCC_LANGUAGE, MODULE_FIELDS, load_module_prefixes, aggregate_by_module,
+                         file_totals, report_paths)
+from scc_batch import split_by_root
+from scc_storage import atomic_write_text, load_json
+
+NULL_SHA = '0' * 40
+# Gitlink (submodule) entries are commits, not blobs
+SUBMODULE_MODE = '160000'
+
+
+def git(repo_dir, *args):
+    return subprocess.run(['git', *args], cwd=repo_dir, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def resolve_range(repo_dir, spec):
+    """Return (base_sha, head_sha) for `base..head`, or `base...head` (base = merge base, as in a PR)."""
+    if '...' in spec:
+        base, head = spec.split('...', 1)
+        base = git(repo_dir, 'merge-base', base or 'HEAD', head or 'HEAD')
+    elif '..' in spec:
+        base, head = spec.split('..', 1)
+    else:
+        raise ValueError(f"Invalid range '{spec}': expected base..head or base...head")
+    base = git(repo_dir, 'rev-parse', '--verify', f'{base or "HEAD"}^{{commit}}')
+    head = git(repo_dir, 'rev-parse', '--verify', f'{head or "HEAD"}^{{commit}}')
+    return base, head
+
+
+def changed_files(repo_dir, base, head, paths):
+    """Files changed between two commits (renames detected), with their old and new blob ids.
+    Returns a list of (status, old_path, new_path, old_blob, new_blob); blobs are None when absent."""
+    out = subprocess.run(['git', 'diff', '--raw', '-z', '--no-abbrev', '-M', base, head, '--'] + paths,
+                         cwd=repo_dir, capture_output=True, check=True).stdout.decode('utf-8', errors='replace')
+    tokens = out.split('\0')
+    changes = []
+    i = 0
+    while i < len(tokens) and tokens[i].startswith(':'):
+        old_mode, new_mode, old_blob, new_blob, status = tokens[i][1:].split(' ')
+        if status[0] in 'RC':
+            old_path, new_path = tokens[i + 1], tokens[i + 2]
+            i += 3
+        else:
+            old_path = new_path = tokens[i + 1]
+            i += 2
+        if SUBMODULE_MODE in (old_mode, new_mode):
+            continue
+        changes.append((status[0],
+                        old_path if old_blob != NULL_SHA else None, new_path if new_blob != NULL_SHA else None,
+                        old_blob if old_blob != NULL_SHA else None, new_blob if new_blob != NULL_SHA else None))
+    return changes
+
+
+def export_blobs(repo_dir, blobs, dest):
+    """Write [(blob, relative_path)] under `dest` with a single `git cat-file --batch` process."""
+    if not blobs:
+        return
+    request = ''.join(f'{blob}\n' for blob, _ in blobs).encode()
+    out = subprocess.run(['git', 'cat-file', '--batch'], cwd=repo_dir, input=request, capture_output=True,
+                         check=True).stdout
+    pos = 0
+    for blob, path in blobs:
+        header_end = out.index(b'\n', pos)
+        header = out[pos:header_end].split(b' ')
+        if len(header) != 3:
+            raise ValueError(f"git cat-file: {out[pos:header_end].decode(errors='replace')}")
+        size = int(header[2])
+        content = out[header_end + 1:header_end + 1 + size]
+        pos = header_end + 1 + size + 1
+        target = os.path.join(dest, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(content)
+
+
+def language_totals(by_file_report):
+    """{language: {field: total}} of a `--by-file` (or language-level) report."""
+    return {lang['Name']: {field: lang.get(field, 0) or 0 for field in MODULE_FIELDS} for lang in by_file_report or []}
+
+
+def subtract(new, old):
+    """Field-wise `new - old` of two {name: {field: value}} dicts; entries with no change are dropped."""
+    delta = {}
+    for name in sorted(set(new) | set(old)):
+        values = {field: (new.get(name, {}).get(field, 0) or 0) - (old.get(name, {}).get(field, 0) or 0)
+                  for field in MODULE_FIELDS}
+        if any(values.values()):
+            delta[name] = values
+    return delta
+
+
+def measure_range(repo_dir, base, head, target=SCC_TARGET, report_dir=None, top=10):
+    """Metric delta of `base..head`, measured on the changed files only (one scc run over old and new blobs).
+    When `report_dir` holds the extracted report of `base`, head totals are derived as stored base + delta."""
+    changes = changed_files(repo_dir, base, head, [target])
+    work_dir = tempfile.mkdtemp(prefix='scc_range_')
+    try:
+        for root in ('base', 'head'):
+            os.makedirs(os.path.join(work_dir, root))
+        export_blobs(repo_dir, [(c[3], c[1]) for c in changes if c[3]], os.path.join(work_dir, 'base'))
+        export_blobs(repo_dir, [(c[4], c[2]) for c in changes if c[4]], os.path.join(work_dir, 'head'))
+        by_file = []
+        if changes:
+            result = subprocess.run(['scc', '--by-file', '--format', 'json', 'base', 'head'], cwd=work_dir,
+                                    capture_output=True, text=True, check=True)
+            by_file = json.loads(result.stdout or '[]') or []
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    reports = split_by_root(by_file, ['base', 'head'])
+    prefixes = load_module_prefixes()
+    old_files = file_totals(reports['base'])
+    new_files = file_totals(reports['head'])
+    files = []
+    for status, old_path, new_path, _, _ in changes:
+        old = old_files.get(old_path, {}) if old_path else {}
+        new = new_files.get(new_path, {}) if new_path else {}
+        code = new.get('Code', 0) - old.get('Code', 0)
+        complexity = new.get('Complexity', 0) - old.get('Complexity', 0)
+        files.append({'path': new_path or old_path, 'old_path': old_path if status == 'R' else None,
+                      'status': status, 'code': code, 'complexity': complexity})
+    files.sort(key=lambda f: (abs(f['code']) + abs(f['complexity'])), reverse=True)
+
+    result = {
+        'base': base,
+        'head': head,
+        'files_changed': len(changes),
+        'languages': subtract(language_totals(reports['head']), language_totals(reports['base'])),
+        'modules': {},
+        'files': files[:top],
+    }
+    old_modules = aggregate_by_module(reports['base'], prefixes)
+    new_modules = aggregate_by_module(reports['head'], prefixes)
+    for module in sorted(set(old_modules) | set(new_modules)):
+        delta = subtract(new_modules.get(module, {}), old_modules.get(module, {}))
+        if delta:
+            result['modules'][module] = delta
+
+    if report_dir:
+        # Reuse the stored totals of the base commit (written by extract_scc_history.py), if it was analyzed
+        paths = report_paths(report_dir, git(repo_dir, 'log', '-1', '--format=%ci', base))
+        stored = load_json(paths['report'])
+        if stored is not None:
+            base_totals = language_totals(stored)
+            head_totals = {}
+            for name in set(base_totals) | set(result['languages']):
+                head_totals[name] = {field: base_totals.get(name, {}).get(field, 0)
+                                     + result['languages'].get(name, {}).get(field, 0) for field in MODULE_FIELDS}
+            result['totals'] = {'base': base_totals, 'head': head_totals}
+    return result
+
+
+def format_markdown(result, language=SCC_LANGUAGE):
+    """Short Markdown summary for a PR comment."""
+    delta = result['languages'].get(language, dict.fromkeys(MODULE_FIELDS, 0))
+    lines = [
+        f"### SCC delta `{result['base'][:10]}..{result['head'][:10]}`",
+        f"**{delta['Code']:+,} lines of code / {delta['Complexity']:+,} complexity** "
+        f"({language}, {result['files_changed']} file(s) changed)",
+    ]
+    totals = result.get('totals')
+    if totals and language in totals['base']:
+        before, after = totals['base'][language]['Code'], totals['head'][language]['Code']
+        percent = f" ({(after - before) / before * 100:+.1f}%)" if before else ''
+        lines.append(f"{language} code: {before:,} → {after:,}{percent}")
+    if result['languages']:
+        lines += ['', '| Language | Files | Code | Comments | Complexity |', '|---|---:|---:|---:|---:|']
+        for name, d in result['languages'].items():
+            lines.append(f"| {name} | {d['Count']:+} | {d['Code']:+,} | {d['Comment']:+,} | {d['Complexity']:+,} |")
+    modules = [(m, d[language]) for m, d in result['modules'].items() if language in d]
+    if modules:
+        lines += ['', '| Module | Code | Complexity |', '|---|---:|---:|']
+        for module, d in sorted(modules, key=lambda md: abs(md[1]['Code']), reverse=True):
+            lines.append(f"| `{module}` | {d['Code']:+,} | {d['Complexity']:+,} |")
+    if result['files']:
+        lines += ['', '| File | Status | Code | Complexity |', '|---|:---:|---:|---:|']
+        for f in result['files']:
+            lines.append(f"| `{f['path']}` | {f['status']} | {f['code']:+,} | {f['complexity']:+,} |")
+    return '\n'.join(lines) + '\n'
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Metric delta between two commits, measured on the changed files only.')
+    parser.add_argument('--range', required=True, dest='spec', help='base..head, or base...head to diff from the merge base')
+    parser.add_argument('--repo', default='.', help='Local clone to analyze (default: current directory)')
+    parser.add_argument('--format', choices=('markdown', 'json'), default='markdown', help='Output format (default: markdown)')
+    parser.add_argument('--output', '-o', help='Write the summary to this file instead of stdout')
+    parser.add_argument('--top', type=int, default=10, help='Changed files listed (default: 10)')
+    args = parser.parse_args()
+
+    base, head = resolve_range(args.repo, args.spec)
+    result = measure_range(args.repo, base, head, report_dir=os.path.abspath(os.getenv('REPORT_DIR', 'scc_reports')),
+                           top=args.top)
+    text = json.dumps(result, indent=2) + '\n' if args.format == 'json' else format_markdown(result)
+    if args.output:
+        atomic_write_text(args.output, text)
+    else:
+        print(text, end='')
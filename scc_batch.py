@@ -0,0 +1,126 @@
+# scc_batch.py
+# Batched analysis: export K commits side by side and count them all with a single scc process
+import os
+import shutil
+import tarfile
+import tempfile
+import subprocess
+import json
+
+# Fields of a `--by-file` entry that add up to the language totals
+SUMMED_FIELDS = ('Bytes', 'Lines', 'Code', 'Comment', 'Blank', 'Complexity', 'WeightedComplexity')
+
+# COCOMO (organic) parameters used by scc's default summary
+COCOMO_AVG_WAGE = 56286
+COCOMO_OVERHEAD = 2.4
+
+
+def has_path(repo_dir, sha, target):
+    """True when `target` exists in the tree of commit `sha`."""
+    path = target.replace('\\', '/').strip('/')
+    path = '' if path in ('', '.') else path
+    result = subprocess.run(['git', 'rev-parse', '--verify', '-q', f'{sha}:{path}'], cwd=repo_dir, capture_output=True)
+    return result.returncode == 0
+
+
+def export_tree(repo_dir, sha, target, dest):
+    """Write the files of `target` at commit `sha` to `dest` (`git archive`, no checkout or worktree needed).
+    Returns False (nothing exported) when the commit has no `target` yet, e.g. early history."""
+    os.makedirs(dest, exist_ok=True)
+    if not has_path(repo_dir, sha, target):
+        return False
+    cmd = ['git', 'archive', '--format=tar', sha, '--', target]
+    proc = subprocess.Popen(cmd, cwd=repo_dir, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        with tarfile.open(fileobj=proc.stdout, mode='r|') as archive:
+            if hasattr(tarfile, 'data_filter'):
+                archive.extractall(dest, filter='data')
+            else:
+                archive.extractall(dest)
+    finally:
+        proc.stdout.close()
+        stderr = proc.stderr.read().decode('utf-8', errors='replace')
+        proc.stderr.close()
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr)
+    return True
+
+
+def split_by_root(by_file_report, roots):
+    """Split a `--by-file` report covering several `<root>/...` trees into {root: report}.
+    File locations lose their `<root>/` prefix and language totals are recomputed from the files,
+    so every part looks like a report produced by running scc inside that tree alone."""
+    files = {root: {} for root in roots}
+    for lang in by_file_report or []:
+        for entry in lang.get('Files') or []:
+            location = entry.get('Location', '').replace('\\', '/')
+            if location.startswith('./'):
+                location = location[2:]
+            root, _, rest = location.partition('/')
+            if root not in files:
+                continue
+            entry = dict(entry, Location=rest)
+            files[root].setdefault(lang.get('Name', ''), []).append(entry)
+
+    reports = {}
+    for root in roots:
+        report = []
+        for name, entries in files[root].items():
+            lang = {'Name': name, 'Count': len(entries)}
+            for field in SUMMED_FIELDS:
+                lang[field] = sum(e.get(field, 0) or 0 for e in entries)
+            lang['Files'] = entries
+            report.append(lang)
+        # scc orders languages by code size
+        report.sort(key=lambda l: l['Code'], reverse=True)
+        reports[root] = report
+    return reports
+
+
+def cocomo_summary(by_file_report):
+    """Text summary equivalent to the plain `scc` output (language table + COCOMO organic estimates),
+    computed from a `--by-file` report instead of a second scc run."""
+    lines = [f"{'Language':<20}{'Files':>8}{'Lines':>10}{'Blanks':>9}{'Comments':>10}{'Code':>9}{'Complexity':>12}"]
+    totals = dict.fromkeys(('Count', 'Lines', 'Blank', 'Comment', 'Code', 'Complexity', 'Bytes'), 0)
+    for lang in by_file_report or []:
+        values = {key: lang.get(key, 0) or 0 for key in totals}
+        lines.append(f"{lang.get('Name', ''):<20}{values['Count']:>8}{values['Lines']:>10}{values['Blank']:>9}"
+                     f"{values['Comment']:>10}{values['Code']:>9}{values['Complexity']:>12}")
+        for key in totals:
+            totals[key] += values[key]
+    lines.append(f"{'Total':<20}{totals['Count']:>8}{totals['Lines']:>10}{totals['Blank']:>9}"
+                 f"{totals['Comment']:>10}{totals['Code']:>9}{totals['Complexity']:>12}")
+
+    effort = 2.4 * (totals['Code'] / 1000) ** 1.05
+    schedule = 2.5 * effort ** 0.38 if effort else 0
+    people = effort / schedule if schedule else 0
+    cost = effort * COCOMO_AVG_WAGE / 12 * COCOMO_OVERHEAD
+    lines += [
+        f"Estimated Cost to Develop (organic) ${int(cost):,}",
+        f"Estimated Schedule Effort (organic) {schedule:.2f} months",
+        f"Estimated People Required (organic) {people:.2f}",
+        f"Processed {totals['Bytes']:,} bytes, {totals['Bytes'] / 1e6:.3f} megabytes (SI)",
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def analyze_batch(repo_dir, shas, target):
+    """Export every commit of `shas` and run one `scc --by-file` over all of them.
+    Returns {sha: by_file_report} with locations relative to the commit root (e.g. `lib/main.dart`);
+    commits without `target` get an empty report."""
+    work_dir = tempfile.mkdtemp(prefix='scc_batch_')
+    try:
+        roots = [f'c{i:04d}' for i in range(len(shas))]
+        targets = []
+        for root, sha in zip(roots, shas):
+            if export_tree(repo_dir, sha, target, os.path.join(work_dir, root)):
+                targets.append(f'{root}/{target}')
+        by_file = []
+        if targets:
+            result = subprocess.run(['scc', '--by-file', '--format', 'json'] + targets, cwd=work_dir,
+                                    capture_output=True, text=True, check=True)
+            by_file = json.loads(result.stdout or '[]') or []
+        reports = split_by_root(by_file, roots)
+        return {sha: reports[root] for root, sha in zip(roots, shas)}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
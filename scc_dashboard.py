@@ -0,0 +1,379 @@
+# scc_dashboard.py
+# Exports the SCC history as a compact columnar data file and a static, client-side HTML dashboard
+import os
+import json
+from datetime import datetime
+
+from scc_storage import atomic_write_text
+
+DATA_FILENAME = 'dashboard_data.js'
+HTML_FILENAME = 'dashboard.html'
+# Stop adding coarser zoom levels once a level has at most this many points
+MIN_LEVEL_POINTS = 200
+MAX_MODULES = 8
+
+# Global series: column -> (label, color, scale); values are stored as integers (value * scale)
+SERIES = {
+    'code': ('Lines of Code', '#3498db', 1),
+    'complexity': ('Complexity', '#e74c3c', 1),
+    'files': ('Files', '#8e44ad', 1),
+    'cost': ('Estimated Cost ($)', '#27ae60', 1),
+    'effort': ('Effort (months)', '#e67e22', 100),
+    'people': ('People', '#7f8c8d', 100),
+    'bytes': ('Bytes', '#8d6e63', 1),
+}
+MODULE_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#17becf']
+
+
+def _delta_encode(values):
+    """Delta-encode a list of integers (cumulative series become small numbers)."""
+    out = []
+    prev = 0
+    for v in values:
+        out.append(v - prev)
+        prev = v
+    return out
+
+
+def _level_indices(n, bucket):
+    """Indices kept for a zoom level: the last point of every `bucket` consecutive points (and the last point)."""
+    idx = list(range(bucket - 1, n, bucket))
+    if not idx or idx[-1] != n - 1:
+        idx.append(n - 1)
+    return idx
+
+
+def build_dashboard_data(times, columns, panels, scales, language=''):
+    """Build the pre-aggregated dashboard payload.
+    `times` are epoch seconds (sorted), `columns` maps a series key to a list of numbers aligned with `times`.
+    Every level keeps the value at the end of each bucket, so client-side differences stay exact."""
+    n = len(times)
+    t0 = times[0] if n else 0
+    int_columns = {
+        key: [int(round((v or 0) * scales.get(key, 1))) for v in values]
+        for key, values in columns.items()
+    }
+    levels = []
+    bucket = 1
+    while n:
+        idx = _level_indices(n, bucket)
+        levels.append({
+            'bucket': bucket,
+            't': _delta_encode([times[i] - t0 for i in idx]),
+            'v': {key: _delta_encode([values[i] for i in idx]) for key, values in int_columns.items()}
+        })
+        if len(idx) <= MIN_LEVEL_POINTS:
+            break
+        bucket *= 2
+    return {
+        'version': 1,
+        'generated': datetime.now().strftime('%Y-%m-%d %H:%M'),
+        'language': language,
+        'points': n,
+        't0': t0,
+        'scale': {key: scale for key, scale in scales.items() if scale != 1},
+        'panels': panels,
+        'levels': levels
+    }
+
+
+def export_dashboard(df, module_df, output_dir, language=''):
+    """Write `dashboard_data.js` and `dashboard.html` to `output_dir` from the history DataFrames.
+    `df` holds one row per commit (date, code, complexity, ...); `module_df` one row per commit and module."""
+    df = df.sort_values(by='date')
+    times = [int(ts.timestamp()) for ts in df['date']]
+    columns = {key: df[key].tolist() for key in SERIES if key in df.columns}
+    scales = {key: SERIES[key][2] for key in columns}
+
+    def series(key):
+        label, color, _ = SERIES[key]
+        return dict(key=key, label=label, color=color)
+
+    panels = [
+        {'title': 'Lines of Code', 'kind': 'line', 'series': [series('code')]},
+        {'title': 'Complexity', 'kind': 'line', 'series': [series('complexity')]},
+        {'title': f'Number of {language} Files', 'kind': 'line', 'series': [series('files')]},
+        {'title': 'Estimated Cost ($)', 'kind': 'line', 'series': [series('cost')]},
+        {'title': 'Estimated Effort / People', 'kind': 'line', 'series': [series('effort'), series('people')]},
+        {'title': 'Bytes Processed', 'kind': 'line', 'series': [series('bytes')]},
+        {'title': 'Code Line Changes', 'kind': 'bar', 'series': [dict(key='diff:code', label='Δ Lines of Code', color='#2ecc40')]},
+        {'title': 'Complexity Changes', 'kind': 'bar', 'series': [dict(key='diff:complexity', label='Δ Complexity', color='#e74c3c')]},
+        {'title': 'Complexity per Line of Code', 'kind': 'line', 'series': [dict(key='ratio:complexity/code', label='Complexity/Line', color='#8b0000')]},
+        {'title': 'Average Lines per File', 'kind': 'line', 'series': [dict(key='ratio:code/files', label='Lines/File', color='#00008b')]},
+    ]
+
+    if module_df is not None and not module_df.empty:
+        # Align the largest modules on the commit timeline (0 when a module does not exist yet)
+        latest = module_df[module_df['date'] == module_df['date'].max()]
+        top_modules = latest.sort_values(by='code', ascending=False)['module'].head(MAX_MODULES).tolist()
+        for metric, title in [('code', 'Lines of Code per Module'), ('complexity', 'Complexity per Module')]:
+            pivot = module_df[module_df['module'].isin(top_modules)].pivot_table(
+                index='date', columns='module', values=metric, aggfunc='last')
+            pivot = pivot.reindex(df['date']).ffill().fillna(0)
+            panel_series = []
+            for i, module in enumerate(top_modules):
+                if module not in pivot.columns:
+                    continue
+                key = f'm:{metric}:{module}'
+                columns[key] = pivot[module].tolist()
+                scales[key] = 1
+                panel_series.append(dict(key=key, label=module, color=MODULE_COLORS[i % len(MODULE_COLORS)]))
+            if panel_series:
+                panels.append({'title': title, 'kind': 'line', 'series': panel_series})
+
+    data = build_dashboard_data(times, columns, panels, scales, language)
+    data_path = os.path.join(output_dir, DATA_FILENAME)
+    # Atomic writes: a killed run never leaves a truncated data file for the page to load
+    atomic_write_text(data_path, 'window.SCC_DASHBOARD_DATA = ' + json.dumps(data, separators=(',', ':')) + ';\n')
+    html_path = os.path.join(output_dir, HTML_FILENAME)
+    atomic_write_text(html_path, DASHBOARD_HTML.replace('__DATA_FILENAME__', DATA_FILENAME))
+    return html_path, data_path
+
+
+# Static page: loads the data file with a <script> tag so it also works from file:// (no server)
+DASHBOARD_HTML = r"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>SCC Dashboard</title>
+<style>
+body { font-family: -apple-system, "Segoe UI", Roboto, sans-serif; margin: 0; background: #f4f6f8; color: #222; }
+header { padding: 12px 20px; background: #2c3e50; color: #fff; }
+header small { opacity: .75; margin-left: 8px; }
+#grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(560px, 1fr)); gap: 14px; padding: 14px; }
+.panel { background: #fff; border-radius: 6px; box-shadow: 0 1px 3px rgba(0,0,0,.15); padding: 8px 10px; }
+.panel h3 { margin: 2px 0 4px; font-size: 14px; }
+.legend span { display: inline-block; margin-right: 12px; font-size: 12px; }
+.legend i { display: inline-block; width: 10px; height: 10px; margin-right: 4px; vertical-align: middle; }
+canvas { width: 100%; height: 260px; display: block; cursor: crosshair; }
+#tip { position: fixed; pointer-events: none; background: rgba(0,0,0,.8); color: #fff; font-size: 12px;
+       padding: 4px 6px; border-radius: 4px; display: none; white-space: pre; }
+</style>
+</head>
+<body>
+<header><b>SCC Dashboard</b><small id="meta"></small><small>wheel: zoom · drag: pan · double-click: reset</small></header>
+<div id="grid"></div>
+<div id="tip"></div>
+<script src="__DATA_FILENAME__"></script>
+<script>
+(function () {
+  'use strict';
+  var D = window.SCC_DASHBOARD_DATA;
+  var grid = document.getElementById('grid');
+  if (!D || !D.points) { grid.textContent = 'No data: __DATA_FILENAME__ missing or empty.'; return; }
+  document.getElementById('meta').textContent =
+    (D.language ? D.language + ' · ' : '') + D.points + ' commits · generated ' + D.generated;
+
+  var PAD = {l: 64, r: 12, t: 8, b: 26};
+
+  // Decode the delta-encoded levels (finest first)
+  function decode(arr, scale, base) {
+    var out = new Array(arr.length), acc = 0;
+    for (var i = 0; i < arr.length; i++) { acc += arr[i]; out[i] = base + acc / scale; }
+    return out;
+  }
+  var levels = D.levels.map(function (lvl) {
+    var L = {bucket: lvl.bucket, t: decode(lvl.t, 1, D.t0).map(function (s) { return s * 1000; }), v: {}, cache: {}};
+    Object.keys(lvl.v).forEach(function (k) { L.v[k] = decode(lvl.v[k], D.scale[k] || 1, 0); });
+    return L;
+  });
+  var full = levels[0];
+  var tMin = full.t[0], tMax = full.t[full.t.length - 1];
+  if (tMax === tMin) { tMin -= 86400000; tMax += 86400000; }
+  var view = {a: tMin, b: tMax};
+
+  // Series values for a level: plain column, 'diff:col' or 'ratio:num/den'
+  function values(L, key) {
+    if (L.cache[key]) return L.cache[key];
+    var out;
+    if (key.indexOf('diff:') === 0) {
+      var src = L.v[key.slice(5)];
+      out = src.map(function (v, i) { return i ? v - src[i - 1] : 0; });
+    } else if (key.indexOf('ratio:') === 0) {
+      var parts = key.slice(6).split('/'), num = L.v[parts[0]], den = L.v[parts[1]];
+      out = num.map(function (v, i) { return den[i] ? v / den[i] : null; });
+    } else {
+      out = L.v[key];
+    }
+    L.cache[key] = out;
+    return out;
+  }
+
+  function lowerBound(arr, x) {
+    var lo = 0, hi = arr.length;
+    while (lo < hi) { var mid = (lo + hi) >> 1; if (arr[mid] < x) lo = mid + 1; else hi = mid; }
+    return lo;
+  }
+
+  // Finest level that still fits the visible range into the available pixels
+  function pickLevel(pixels) {
+    for (var i = 0; i < levels.length; i++) {
+      var L = levels[i];
+      if (lowerBound(L.t, view.b) - lowerBound(L.t, view.a) <= pixels / 2) return L;
+    }
+    return levels[levels.length - 1];
+  }
+
+  function niceStep(range, count) {
+    var raw = range / count, mag = Math.pow(10, Math.floor(Math.log10(raw || 1))), n = raw / mag;
+    return (n < 1.5 ? 1 : n < 3 ? 2 : n < 7 ? 5 : 10) * mag;
+  }
+  function fmtNum(v) {
+    var a = Math.abs(v);
+    if (a >= 1e6) return (v / 1e6).toFixed(1) + 'M';
+    if (a >= 1e4) return (v / 1e3).toFixed(0) + 'k';
+    return Math.abs(v - Math.round(v)) < 1e-9 ? String(Math.round(v)) : v.toFixed(2);
+  }
+  function fmtDate(ms) { return new Date(ms).toISOString().slice(0, 10); }
+
+  var panels = D.panels.map(function (spec) {
+    var el = document.createElement('div');
+    el.className = 'panel';
+    el.innerHTML = '<h3></h3><div class="legend"></div><canvas></canvas>';
+    el.querySelector('h3').textContent = spec.title;
+    var legend = el.querySelector('.legend');
+    spec.series.forEach(function (s) {
+      var span = document.createElement('span');
+      span.innerHTML = '<i></i>';
+      span.firstChild.style.background = s.color;
+      span.appendChild(document.createTextNode(s.label));
+      legend.appendChild(span);
+    });
+    grid.appendChild(el);
+    var p = {spec: spec, canvas: el.querySelector('canvas')};
+    attach(p);
+    return p;
+  });
+
+  function layout(p) {
+    var c = p.canvas, w = c.clientWidth, h = c.clientHeight;
+    return {w: w, h: h, x0: PAD.l, x1: w - PAD.r, y0: PAD.t, y1: h - PAD.b};
+  }
+  function xOf(box, t) { return box.x0 + (t - view.a) / (view.b - view.a) * (box.x1 - box.x0); }
+  function tOf(box, x) { return view.a + (x - box.x0) / (box.x1 - box.x0) * (view.b - view.a); }
+
+  function draw(p) {
+    var c = p.canvas, box = layout(p), dpr = window.devicePixelRatio || 1;
+    c.width = box.w * dpr; c.height = box.h * dpr;
+    var g = c.getContext('2d');
+    g.setTransform(dpr, 0, 0, dpr, 0, 0);
+    g.clearRect(0, 0, box.w, box.h);
+    var L = pickLevel(box.x1 - box.x0);
+    var i0 = Math.max(0, lowerBound(L.t, view.a) - 1);
+    var i1 = Math.min(L.t.length - 1, lowerBound(L.t, view.b));
+    var bar = p.spec.kind === 'bar';
+    var lo = bar ? 0 : Infinity, hi = bar ? 0 : -Infinity;
+    p.spec.series.forEach(function (s) {
+      var v = values(L, s.key);
+      for (var i = i0; i <= i1; i++) { if (v[i] !== null) { lo = Math.min(lo, v[i]); hi = Math.max(hi, v[i]); } }
+    });
+    if (!isFinite(lo)) { lo = 0; hi = 1; }
+    if (hi === lo) { hi += 1; lo -= bar ? 1 : 0; }
+    var yStep = niceStep(hi - lo, 5);
+    lo = Math.floor(lo / yStep) * yStep; hi = Math.ceil(hi / yStep) * yStep;
+    function yOf(v) { return box.y1 - (v - lo) / (hi - lo) * (box.y1 - box.y0); }
+
+    // Grid and axes
+    g.strokeStyle = '#e3e6ea'; g.fillStyle = '#555'; g.font = '11px sans-serif'; g.lineWidth = 1;
+    g.textAlign = 'right'; g.textBaseline = 'middle';
+    for (var y = lo; y <= hi + yStep / 2; y += yStep) {
+      g.beginPath(); g.moveTo(box.x0, yOf(y)); g.lineTo(box.x1, yOf(y)); g.stroke();
+      g.fillText(fmtNum(y), box.x0 - 6, yOf(y));
+    }
+    g.textAlign = 'center'; g.textBaseline = 'top';
+    var ticks = Math.max(2, Math.floor((box.x1 - box.x0) / 110));
+    for (var k = 0; k <= ticks; k++) {
+      var t = view.a + (view.b - view.a) * k / ticks;
+      g.fillText(fmtDate(t), xOf(box, t), box.y1 + 6);
+    }
+    g.save();
+    g.beginPath(); g.rect(box.x0, box.y0, box.x1 - box.x0, box.y1 - box.y0); g.clip();
+    p.spec.series.forEach(function (s) {
+      var v = values(L, s.key);
+      if (bar) {
+        var bw = Math.max(1, (box.x1 - box.x0) / Math.max(1, i1 - i0 + 1) * 0.8);
+        for (var i = i0; i <= i1; i++) {
+          g.fillStyle = v[i] > 0 ? '#2ecc40' : v[i] < 0 ? '#e74c3c' : '#999';
+          var x = xOf(box, L.t[i]), y0 = yOf(0), y1 = yOf(v[i]);
+          g.fillRect(x - bw / 2, Math.min(y0, y1), bw, Math.max(1, Math.abs(y1 - y0)));
+        }
+      } else {
+        g.strokeStyle = s.color; g.lineWidth = 1.6; g.beginPath();
+        var pen = false;
+        for (var j = i0; j <= i1; j++) {
+          if (v[j] === null) { pen = false; continue; }
+          var px = xOf(box, L.t[j]), py = yOf(v[j]);
+          if (pen) g.lineTo(px, py); else { g.moveTo(px, py); pen = true; }
+        }
+        g.stroke();
+      }
+    });
+    if (p.hover !== undefined && p.hover >= i0 && p.hover <= i1) {
+      g.strokeStyle = 'rgba(0,0,0,.35)'; g.beginPath();
+      g.moveTo(xOf(box, L.t[p.hover]), box.y0); g.lineTo(xOf(box, L.t[p.hover]), box.y1); g.stroke();
+    }
+    g.restore();
+    p.level = L;
+  }
+
+  var pending = false;
+  function redraw() {
+    if (pending) return;
+    pending = true;
+    requestAnimationFrame(function () { pending = false; panels.forEach(draw); });
+  }
+
+  function clampView(a, b) {
+    var span = Math.min(b - a, tMax - tMin);
+    span = Math.max(span, 3600000);
+    if (a < tMin) a = tMin;
+    if (a + span > tMax) a = tMax - span;
+    view.a = a; view.b = a + span;
+  }
+
+  var tip = document.getElementById('tip');
+  function attach(p) {
+    var c = p.canvas, drag = null;
+    c.addEventListener('wheel', function (e) {
+      e.preventDefault();
+      var box = layout(p), rect = c.getBoundingClientRect();
+      var t = tOf(box, e.clientX - rect.left), f = e.deltaY > 0 ? 1.25 : 0.8;
+      clampView(t - (t - view.a) * f, t + (view.b - t) * f);
+      redraw();
+    }, {passive: false});
+    c.addEventListener('mousedown', function (e) { drag = {x: e.clientX, a: view.a, b: view.b}; });
+    window.addEventListener('mouseup', function () { drag = null; });
+    window.addEventListener('mousemove', function (e) {
+      if (!drag) return;
+      var box = layout(p), dt = (e.clientX - drag.x) / (box.x1 - box.x0) * (drag.b - drag.a);
+      clampView(drag.a - dt, drag.b - dt);
+      redraw();
+    });
+    c.addEventListener('dblclick', function () { view.a = tMin; view.b = tMax; redraw(); });
+    c.addEventListener('mousemove', function (e) {
+      var L = p.level;
+      if (!L || drag) { tip.style.display = 'none'; return; }
+      var box = layout(p), rect = c.getBoundingClientRect(), t = tOf(box, e.clientX - rect.left);
+      var i = Math.min(L.t.length - 1, lowerBound(L.t, t));
+      if (i > 0 && t - L.t[i - 1] < L.t[i] - t) i--;
+      p.hover = i;
+      var lines = [fmtDate(L.t[i]) + (L.bucket > 1 ? '  (1/' + L.bucket + ' commits)' : '')];
+      p.spec.series.forEach(function (s) {
+        var v = values(L, s.key)[i];
+        lines.push(s.label + ': ' + (v === null ? '-' : fmtNum(v)));
+      });
+      tip.textContent = lines.join('\n');
+      tip.style.left = (e.clientX + 14) + 'px'; tip.style.top = (e.clientY + 14) + 'px';
+      tip.style.display = 'block';
+      redraw();
+    });
+    c.addEventListener('mouseleave', function () { tip.style.display = 'none'; p.hover = undefined; redraw(); });
+  }
+
+  window.addEventListener('resize', redraw);
+  redraw();
+})();
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,148 @@
+# scc_modules.py
+# Per-module aggregation of a single `scc --by-file` pass (shared by extraction, graphs and report)
+import os
+import json
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Directory analyzed by scc inside the repository and language tracked by the graphs/report
+SCC_TARGET = os.getenv('SCC_TARGET', 'lib/')
+SCC_LANGUAGE = os.getenv('SCC_LANGUAGE', 'Dart')
+# Comma-separated directory prefixes; a trailing '/*' creates one module per subdirectory
+DEFAULT_MODULE_PREFIXES = 'lib/features/*,lib/core,lib'
+OTHER_MODULE = '(other)'
+
+# scc fields summed per module and language
+MODULE_FIELDS = ('Count', 'Code', 'Comment', 'Blank', 'Complexity', 'Bytes')
+MODULES_SUFFIX = '_modules.json'
+
+
+def load_module_prefixes():
+    """Return the configured module prefixes, normalized and most specific first."""
+    raw = os.getenv('MODULE_PREFIXES', DEFAULT_MODULE_PREFIXES)
+    prefixes = []
+    for p in raw.split(','):
+        p = p.strip().replace('\\', '/').strip('/')
+        if p and p not in prefixes:
+            prefixes.append(p)
+    # Longest prefix wins, so `lib/features/*` is tried before `lib`
+    prefixes.sort(key=lambda p: len(p.rstrip('*').rstrip('/')), reverse=True)
+    return prefixes
+
+
+def module_for_path(path, prefixes):
+    """Map a file path reported by scc to its module name.
+    A prefix ending with '/*' maps `base/<dir>/...` to `base/<dir>`; files directly in `base` map to `base`.
+    Paths matching no prefix are grouped under OTHER_MODULE."""
+    path = path.replace('\\', '/')
+    if path.startswith('./'):
+        path = path[2:]
+    for prefix in prefixes:
+        if prefix.endswith('/*'):
+            base = prefix[:-2]
+            if not path.startswith(base + '/'):
+                continue
+            rest = path[len(base) + 1:].split('/')
+            if len(rest) > 1:
+                return f'{base}/{rest[0]}'
+            return base
+        if path == prefix or path.startswith(prefix + '/'):
+            return prefix
+    return OTHER_MODULE
+
+
+def aggregate_by_module(by_file_report, prefixes):
+    """Aggregate a `scc --by-file --format json` report into {module: {language: {field: total}}}."""
+    modules = {}
+    for lang in by_file_report or []:
+        lang_name = lang.get('Name', '')
+        for entry in lang.get('Files') or []:
+            module = module_for_path(entry.get('Location', ''), prefixes)
+            totals = modules.setdefault(module, {}).setdefault(
+                lang_name, dict.fromkeys(MODULE_FIELDS, 0))
+            totals['Count'] += 1
+            for field in MODULE_FIELDS[1:]:
+                totals[field] += entry.get(field, 0) or 0
+    return modules
+
+
+def file_totals(by_file_report, fields=('Code', 'Complexity')):
+    """Return {path: {field: value}} for every file of a `--by-file` report (paths normalized to '/')."""
+    totals = {}
+    for lang in by_file_report or []:
+        for entry in lang.get('Files') or []:
+            path = entry.get('Location', '').replace('\\', '/')
+            if path.startswith('./'):
+                path = path[2:]
+            totals[path] = {field: entry.get(field, 0) or 0 for field in fields}
+    return totals
+
+
+def strip_file_details(by_file_report):
+    """Return the language-level report (same shape as `scc --format json`) without per-file entries."""
+    return [{k: v for k, v in lang.items() if k != 'Files'} for lang in by_file_report or []]
+
+
+def modules_file_for(report_file):
+    """Path of the per-module totals stored next to a `scc_<date>.json` report."""
+    return report_file[:-len('.json')] + MODULES_SUFFIX
+
+
+def report_paths(output_dir, commit_date):
+    """Paths of the report files of a commit (named after its `git log %ci` date)."""
+    # Clean formatting for filename
+    commit_date_fmt = commit_date.replace(' ', '_').replace(':', '-').replace('/', '-').replace('.', '-')
+    report_file = os.path.join(output_dir, f'scc_{commit_date_fmt}.json')
+    return {
+        'report': report_file,
+        'modules': modules_file_for(report_file),
+        'summary': os.path.join(output_dir, f'scc_{commit_date_fmt}_summary.txt')
+    }
+
+
+def is_report_file(filename):
+    """True for language-level `scc_<date>.json` reports (excludes per-module files)."""
+    return filename.startswith('scc_') and filename.endswith('.json') and not filename.endswith(MODULES_SUFFIX)
+
+
+def report_date_str(filename):
+    """Return the `%Y-%m-%d_%H-%M-%S` part of a report filename (timezone suffix removed)."""
+    date_str = filename[len('scc_'):]
+    for suffix in (MODULES_SUFFIX, '.json'):
+        if date_str.endswith(suffix):
+            date_str = date_str[:-len(suffix)]
+            break
+    return date_str.split('_+')[0].split('_-')[0]
+
+
+def load_module_history(report_dir, language=SCC_LANGUAGE):
+    """Load per-module totals for `language` from every `scc_<date>_modules.json` file.
+    Returns a list of dicts (date string as `%Y-%m-%d_%H-%M-%S`, module, files, code, complexity, bytes)."""
+    rows = []
+    if not os.path.isdir(report_dir):
+        return rows
+    for file in sorted(os.listdir(report_dir)):
+        if not (file.startswith('scc_') and file.endswith(MODULES_SUFFIX)):
+            continue
+        try:
+            with open(os.path.join(report_dir, file), 'r', encoding='utf-8') as f:
+                modules = json.load(f)
+        except Exception as e:
+            print(f"Error on {file}: {e}")
+            continue
+        date_str = report_date_str(file)
+        for module, langs in modules.items():
+            totals = langs.get(language)
+            if not totals:
+                continue
+            rows.append({
+                'date_str': date_str,
+                'module': module,
+                'files': totals.get('Count', 0),
+                'code': totals.get('Code', 0),
+                'complexity': totals.get('Complexity', 0),
+                'bytes': totals.get('Bytes', 0)
+            })
+    return rows
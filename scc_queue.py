@@ -0,0 +1,136 @@
+# scc_queue.py
+# Shared SQLite work queue for sharded extraction (coordinator enqueues shards, workers lease them)
+import json
+import time
+import sqlite3
+
+DEFAULT_LEASE_SECONDS = 900
+# A shard whose worker failed this many times is parked as 'failed'
+MAX_SHARD_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS shards (
+    id INTEGER PRIMARY KEY,
+    commits TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS queued_commits (sha TEXT PRIMARY KEY, shard_id INTEGER);
+"""
+
+
+class WorkQueue:
+    """Work queue stored in a single SQLite file (on storage shared by all hosts).
+    Every state change runs in an IMMEDIATE transaction, so claims never hand the same shard to two workers;
+    leases that expire (worker killed, host lost) are put back to 'pending' by the next claim,
+    until the shard reaches MAX_SHARD_ATTEMPTS and is parked as 'failed'."""
+
+    def __init__(self, path, timeout=60):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        # Rollback journal (not WAL): WAL needs shared memory and does not work on network filesystems
+        self.conn.execute('PRAGMA journal_mode=DELETE')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _transaction(self):
+        return _Transaction(self.conn)
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        with self._transaction():
+            self.conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, json.dumps(value)))
+
+    def enqueue(self, commits, shard_size):
+        """Split [(sha, date)] into shards of `shard_size` commits, skipping commits of pending or leased shards.
+        Safe to call again (idempotent coordinator runs). Returns the number of new shards."""
+        added = 0
+        with self._transaction():
+            # Commits of finished shards can be queued again (e.g. they failed inside the shard)
+            queued = {row[0] for row in self.conn.execute(
+                "SELECT q.sha FROM queued_commits q JOIN shards s ON s.id = q.shard_id "
+                "WHERE s.status IN ('pending', 'leased')")}
+            pending = [list(c) for c in commits if c[0] not in queued]
+            for start in range(0, len(pending), shard_size):
+                chunk = pending[start:start + shard_size]
+                cur = self.conn.execute('INSERT INTO shards (commits) VALUES (?)', (json.dumps(chunk),))
+                self.conn.executemany('INSERT OR REPLACE INTO queued_commits (sha, shard_id) VALUES (?, ?)',
+                                      [(sha, cur.lastrowid) for sha, _ in chunk])
+                added += 1
+        return added
+
+    def claim(self, worker, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """Lease the next pending shard to `worker`. Returns (shard_id, commits) or None when nothing is claimable."""
+        now = time.time()
+        with self._transaction():
+            self._requeue_expired(now)
+            row = self.conn.execute(
+                "SELECT id, commits FROM shards WHERE status = 'pending' ORDER BY id LIMIT 1").fetchone()
+            if not row:
+                return None
+            self.conn.execute("UPDATE shards SET status = 'leased', worker = ?, lease_expires = ? WHERE id = ?",
+                              (worker, now + lease_seconds, row[0]))
+        return row[0], [tuple(c) for c in json.loads(row[1])]
+
+    def renew(self, shard_id, worker, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """Extend the lease; False if the worker lost it (expired and reclaimed by another worker)."""
+        with self._transaction():
+            cur = self.conn.execute(
+                "UPDATE shards SET lease_expires = ? WHERE id = ? AND worker = ? AND status = 'leased'",
+                (time.time() + lease_seconds, shard_id, worker))
+            return cur.rowcount == 1
+
+    def complete(self, shard_id, worker, error=None):
+        """Mark a leased shard as done (`error` keeps a summary of commits that failed inside it)."""
+        with self._transaction():
+            self.conn.execute(
+                "UPDATE shards SET status = 'done', lease_expires = NULL, error = ? WHERE id = ? AND worker = ?",
+                (error, shard_id, worker))
+
+    def release(self, shard_id, worker, error):
+        """Give a shard back after a worker-level failure; parked as 'failed' after MAX_SHARD_ATTEMPTS."""
+        with self._transaction():
+            self.conn.execute(
+                "UPDATE shards SET attempts = attempts + 1, error = ?, worker = NULL, lease_expires = NULL, "
+                "status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END "
+                "WHERE id = ? AND worker = ?",
+                (error, MAX_SHARD_ATTEMPTS, shard_id, worker))
+
+    def _requeue_expired(self, now):
+        # An expired lease counts as a failed attempt: a shard that keeps killing its workers gets parked
+        self.conn.execute(
+            "UPDATE shards SET worker = NULL, lease_expires = NULL, attempts = attempts + 1, error = 'lease expired', "
+            "status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END "
+            "WHERE status = 'leased' AND lease_expires < ?", (MAX_SHARD_ATTEMPTS, now))
+
+    def requeue_expired(self):
+        with self._transaction():
+            self._requeue_expired(time.time())
+
+    def progress(self):
+        """Shard counts per status, e.g. {'pending': 3, 'leased': 2, 'done': 10}."""
+        return dict(self.conn.execute('SELECT status, COUNT(*) FROM shards GROUP BY status').fetchall())
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK (takes the write lock up front so read-then-update is atomic)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('COMMIT' if exc_type is None else 'ROLLBACK')
+        return False
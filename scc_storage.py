@@ -0,0 +1,143 @@
+# scc_storage.py
+# Crash-safe writes and the extraction progress journal
+import os
+import glob
+import json
+import time
+import tempfile
+from datetime import datetime
+
+JOURNAL_FILE = 'extract_journal.jsonl'
+PLAN_FILE = 'extract_plan.json'
+TEMP_PREFIX = '.tmp_'
+
+# mkstemp creates files with mode 0600: give new files the mode a plain open() would (0666 minus the umask)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+DEFAULT_FILE_MODE = 0o666 & ~_UMASK
+
+
+def atomic_write_text(path, text):
+    """Write `text` to `path` through a temporary file + rename, so readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=directory)
+    try:
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except OSError:
+            mode = DEFAULT_FILE_MODE
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            if hasattr(os, 'fchmod'):
+                os.fchmod(f.fileno(), mode)
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def remove_stale_temp_files(directory, max_age=3600):
+    """Delete temporary files left by writers killed before their rename.
+    Only files older than `max_age` seconds are removed, so concurrent writers (sharded workers) are not disturbed."""
+    removed = 0
+    now = time.time()
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return 0
+    for name in names:
+        if not name.startswith(TEMP_PREFIX):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            if now - os.path.getmtime(path) > max_age:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def atomic_write_json(path, obj, compact=False):
+    """Atomically write `obj` as JSON."""
+    separators = (',', ':') if compact else None
+    atomic_write_text(path, json.dumps(obj, separators=separators))
+
+
+def load_json(path, default=None):
+    """Load a JSON file, returning `default` when it is missing, truncated or invalid."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+class ExtractionJournal:
+    """Append-only journal of analyzed commits (`extract_journal.jsonl`).
+    Each line records one attempt: {"sha", "status": "done"|"failed", "date", "error", "at"}.
+    Sharded workers append to their own `extract_journal.<worker>.jsonl`; all journals are read.
+    A done commit stays done; failed attempts are counted for bounded retries."""
+
+    def __init__(self, output_dir, worker=None):
+        name = JOURNAL_FILE if not worker else JOURNAL_FILE.replace('.jsonl', f'.{worker}.jsonl')
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, name)
+        self.entries = {}
+        self.reload()
+
+    def reload(self):
+        """(Re)read every journal of the output directory."""
+        self.entries = {}
+        pattern = os.path.join(glob.escape(self.output_dir), JOURNAL_FILE.replace('.jsonl', '*.jsonl'))
+        for path in sorted(glob.glob(pattern)):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Last line may be truncated if the process was killed while appending
+                        continue
+                    self._apply(record)
+
+    def _apply(self, record):
+        entry = self.entries.setdefault(record['sha'], {'status': None, 'attempts': 0, 'error': None})
+        if entry['status'] == 'done' and record['status'] != 'done':
+            return
+        entry['status'] = record['status']
+        entry['date'] = record.get('date')
+        if record['status'] == 'failed':
+            entry['attempts'] += 1
+            entry['error'] = record.get('error')
+        else:
+            entry['error'] = None
+
+    def _append(self, record):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._apply(record)
+
+    def mark_done(self, sha, date=None):
+        self._append({'sha': sha, 'status': 'done', 'date': date, 'at': datetime.now().isoformat(timespec='seconds')})
+
+    def mark_failed(self, sha, error, date=None):
+        self._append({'sha': sha, 'status': 'failed', 'date': date, 'error': str(error)[-500:],
+                      'at': datetime.now().isoformat(timespec='seconds')})
+
+    def is_done(self, sha):
+        return self.entries.get(sha, {}).get('status') == 'done'
+
+    def failed_attempts(self, sha):
+        entry = self.entries.get(sha)
+        return entry['attempts'] if entry and entry['status'] == 'failed' else 0
+
+    def failures(self):
+        """Commits whose last attempt failed: {sha: entry}."""
+        return {sha: e for sha, e in self.entries.items() if e['status'] == 'failed'}
@@ -1,7 +1,10 @@
 # send_scc_discord_report.py
 # Sends a weekly SCC report to Discord
 import os
+import sys
 import json
+import hashlib
+import argparse
 import pandas as pd
 import matplotlib.pyplot as plt
 import requests
@@ -13,6 +16,10 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+from scc_modules import SCC_LANGUAGE, is_report_file, report_date_str, load_module_history
+from extract_scc_churn import CHURN_RECENT_DAYS, LATEST_FILES_FILE, compute_hotspots
+from scc_storage import atomic_write_json, load_json
+
 REPORT_DIR = os.getenv('REPORT_DIR', 'scc_reports')
 GRAPH_DIR = os.getenv('GRAPH_DIR', 'scc_graphs')
 WEBHOOK_URL = os.getenv('DISCORD_WEBHOOK_URL', '')
@@ -20,15 +27,63 @@ WEBHOOK_URL = os.getenv('DISCORD_WEBHOOK_URL', '')
 WEBHOOK_USERNAME = "SCC Bot"
 WEBHOOK_AVATAR_URL = os.getenv('WEBHOOK_AVATAR_URL', 'https://icons-for-free.com/iff/png/512/graph+graphic+graphics+icon-1320168051322057462.png')
 AUTO_GENERATE_GRAPHS = os.getenv('AUTO_GENERATE_GRAPHS', 'true').lower() in ('true', '1', 'yes')
+# Last sent report (newest report, key totals, graph hashes) and parsed report rows cache
+REPORT_STATE_FILE = os.getenv('REPORT_STATE_FILE', os.path.join(REPORT_DIR, 'last_report.json'))
+HISTORY_CACHE_FILE = os.path.join(REPORT_DIR, 'history_cache.json')
+
+parser = argparse.ArgumentParser(description='Send the SCC report to Discord (only when something changed since the last one).')
+parser.add_argument('--force', action='store_true', help='Send even if nothing changed since the last report')
+args = parser.parse_args()
+
+def file_sha256(path):
+    """SHA-256 of a file, or None when it does not exist."""
+    if not os.path.exists(path):
+        return None
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def data_fingerprint(frame, columns):
+    """Stable hash of the data a graph is drawn from."""
+    h = hashlib.sha256()
+    h.update(frame['date'].astype(str).str.cat(sep=',').encode('utf-8'))
+    for col in columns:
+        h.update(frame[col].astype(str).str.cat(sep=',').encode('utf-8'))
+    return h.hexdigest()
+
+state = load_json(REPORT_STATE_FILE, {})
+
+# Cheap check before loading anything: is there a report newer than the last sent one?
+json_files = [f for f in os.listdir(REPORT_DIR) if is_report_file(f)]
+latest_report = max(json_files, key=report_date_str) if json_files else None
+if not args.force and latest_report and latest_report == state.get('last_report'):
+    print(f"No new commits since the last report ({state.get('sent_at')}). Nothing sent (use --force to resend).")
+    sys.exit(0)
 
 # Auto-generate graphs if requested
 if AUTO_GENERATE_GRAPHS:
     import plot_scc_history
 
-# Load SCC data
-json_files = [f for f in os.listdir(REPORT_DIR) if f.endswith('.json')]
+# Load SCC data (reports are immutable: only files not in the cache are parsed)
+history_cache = load_json(HISTORY_CACHE_FILE, {})
+cache_updated = False
 data = []
+def report_mtime(file):
+    """Latest modification time of a report and its summary (a re-analyzed commit invalidates the cache)."""
+    path_json = os.path.join(REPORT_DIR, file)
+    path_summary = path_json.replace('.json', '_summary.txt')
+    return max(os.path.getmtime(p) for p in (path_json, path_summary) if os.path.exists(p))
+
 for file in sorted(json_files):
+    mtime = report_mtime(file)
+    cached = history_cache.get(file)
+    if cached and cached.get('mtime') == mtime:
+        row = {k: v for k, v in cached.items() if k != 'mtime'}
+        row['date'] = pd.Timestamp(row['date'])
+        data.append(row)
+        continue
     commit_date_str = file.replace('scc_', '').replace('.json', '')
     # Fix: remove timezone suffix (_+xxxx or _-xxxx)
     if '_+' in commit_date_str:
@@ -44,7 +99,7 @@ for file in sorted(json_files):
     try:
         with open(path_json, 'r', encoding='utf-8') as f:
             report = json.load(f)
-            lang = next((l for l in report if l.get('Name') == 'Dart'), None)
+            lang = next((l for l in report if l.get('Name') == SCC_LANGUAGE), None)
             files = lang.get('Count', 0) if lang else 0
             code = lang.get('Code', 0) if lang else 0
             complexity = lang.get('Complexity', 0) if lang else 0
@@ -64,7 +119,7 @@ for file in sorted(json_files):
                     people = float(people_match.group(1))
                 if bytes_match:
                     bytes_processed = int(bytes_match.group(1).replace(',', ''))
-        data.append({
+        row = {
             'date': commit_date,
             'files': files,
             'code': code,
@@ -73,24 +128,40 @@ for file in sorted(json_files):
             'effort': effort,
             'people': people,
             'bytes': bytes_processed
-        })
+        }
+        data.append(row)
+        history_cache[file] = dict(row, date=commit_date.isoformat(), mtime=mtime)
+        cache_updated = True
     except Exception as e:
         continue
+if cache_updated:
+    atomic_write_json(HISTORY_CACHE_FILE, history_cache)
 if not data:
     print('No usable data.')
     exit(1)
 df = pd.DataFrame(data).sort_values(by='date')
 
-# Filter last week
+# Report period: since the newest commit of the last sent report (same clock as the report dates),
+# or the last week on first run
 now = datetime.now()
-week_ago = now - timedelta(days=7)
-df_week = df[df['date'] >= week_ago]
-
-# Key statistics
-code_change = int(df_week['code'].iloc[-1] - df_week['code'].iloc[0]) if len(df_week) > 1 else 0
-files_change = int(df_week['files'].iloc[-1] - df_week['files'].iloc[0]) if len(df_week) > 1 else 0
-complexity_change = int(df_week['complexity'].iloc[-1] - df_week['complexity'].iloc[0]) if len(df_week) > 1 else 0
-cost_change = int(df_week['cost'].iloc[-1] - df_week['cost'].iloc[0]) if len(df_week) > 1 else 0
+if state.get('last_commit_date'):
+    period_start = pd.Timestamp(state['last_commit_date'])
+else:
+    period_start = pd.Timestamp(now - timedelta(days=7))
+df_week = df[df['date'] >= period_start]
+
+# Key statistics: delta against the totals of the last sent report when known
+previous_totals = state.get('totals')
+if previous_totals:
+    code_change = int(df['code'].iloc[-1] - previous_totals['code'])
+    files_change = int(df['files'].iloc[-1] - previous_totals['files'])
+    complexity_change = int(df['complexity'].iloc[-1] - previous_totals['complexity'])
+    cost_change = int(df['cost'].iloc[-1] - previous_totals['cost'])
+else:
+    code_change = int(df_week['code'].iloc[-1] - df_week['code'].iloc[0]) if len(df_week) > 1 else 0
+    files_change = int(df_week['files'].iloc[-1] - df_week['files'].iloc[0]) if len(df_week) > 1 else 0
+    complexity_change = int(df_week['complexity'].iloc[-1] - df_week['complexity'].iloc[0]) if len(df_week) > 1 else 0
+    cost_change = int(df_week['cost'].iloc[-1] - df_week['cost'].iloc[0]) if len(df_week) > 1 else 0
 
 max_code = df['code'].max()
 max_code_date = df.loc[df['code'].idxmax(), 'date'].strftime('%d/%m/%Y')
@@ -116,51 +187,100 @@ if len(df_3m) >= 2:
 else:
     avg_weekly_code = avg_weekly_files = avg_weekly_complexity = avg_weekly_cost = 0
 
-# Generate main graph (code/complexity evolution)
-plt.figure(figsize=(10,5))
-# Plot curves only (no points)
-plt.plot(df['date'], df['code'], label='Lines of Code', color='#3498db')
-plt.plot(df['date'], df['complexity'], label='Complexity', color='#e74c3c')
-plt.title('Code and Complexity Evolution')
-plt.xlabel('Date')
-plt.ylabel('Value')
-plt.legend()
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
+# Per-module weekly changes (from the per-module totals written by the extractor)
+module_df = pd.DataFrame(load_module_history(REPORT_DIR))
+modules_block = ''
+if not module_df.empty:
+    module_df['date'] = pd.to_datetime(module_df['date_str'], format='%Y-%m-%d_%H-%M-%S', errors='coerce')
+    module_df = module_df.dropna(subset=['date'])
+    current_modules = module_df[module_df['date'] == module_df['date'].max()].set_index('module')
+    module_week = module_df[module_df['date'] >= period_start]
+    if state.get('modules'):
+        # Module totals of the last sent report
+        base_modules = pd.DataFrame.from_dict(state['modules'], orient='index', columns=['code', 'complexity'])
+    elif module_week['date'].nunique() > 1:
+        base_modules = module_week[module_week['date'] == module_week['date'].min()].set_index('module')
+    else:
+        base_modules = current_modules
+    module_lines = ['**Modules (top 8 by lines of code):**']
+    for module, row in current_modules.sort_values(by='code', ascending=False).head(8).iterrows():
+        base_code = int(base_modules.loc[module, 'code']) if module in base_modules.index else 0
+        base_cplx = int(base_modules.loc[module, 'complexity']) if module in base_modules.index else 0
+        module_lines.append(
+            f"• `{module}`: {int(row['code']):,} lines ({int(row['code']) - base_code:+,}), "
+            f"complexity {int(row['complexity']):,} ({int(row['complexity']) - base_cplx:+,})")
+    modules_block = '\n' + '\n'.join(module_lines) + '\n\n━━━━━━━━━━━━━━━━━━━━\n'
+
+# The weekly graphs only cover the report period, so history already reported is never redrawn:
+# `df_week` starts at the last reported commit (baseline of the evolution curve), `df_period` holds the new commits
+df_period = df[df['date'] > period_start]
+if df_period.empty:
+    # Forced resend without new commits: show the last analyzed commit
+    df_period = df.tail(1)
+if df_week.empty:
+    df_week = df.tail(1)
+
+def graph_is_current(name, fingerprint):
+    """True when `name` was drawn from the same data for the last report and is unchanged on disk."""
+    saved = state.get('graphs', {}).get(name, {})
+    return saved.get('data') == fingerprint and saved.get('sha256') == file_sha256(os.path.join(GRAPH_DIR, name))
+
+graph_fingerprints = {
+    'weekly_main.png': data_fingerprint(df_week, ['code', 'complexity']),
+    'weekly_changes.png': data_fingerprint(df_period, ['code_change', 'complexity_change']),
+}
+
+# Generate main graph (code/complexity evolution over the period)
 graph_path = os.path.join(GRAPH_DIR, 'weekly_main.png')
-plt.savefig(graph_path)
-plt.close()
+if graph_is_current('weekly_main.png', graph_fingerprints['weekly_main.png']):
+    print('♻️ weekly_main.png unchanged, reusing it')
+else:
+    plt.figure(figsize=(10,5))
+    # Plot curves only (no points)
+    plt.plot(df_week['date'], df_week['code'], label='Lines of Code', color='#3498db')
+    plt.plot(df_week['date'], df_week['complexity'], label='Complexity', color='#e74c3c')
+    plt.title('Code and Complexity Evolution')
+    plt.xlabel('Date')
+    plt.ylabel('Value')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(graph_path)
+    plt.close()
 
 # Generate variations per commit graph (code_change and complexity_change)
-plt.figure(figsize=(12,6))
-bar_width = 0.4
-x = np.arange(len(df))
-# Dynamic colors based on sign
-code_colors = ['#2ecc40' if v > 0 else '#3498db' for v in df['code_change']]
-cplx_colors = ['#e74c3c' if v > 0 else '#f1c40f' for v in df['complexity_change']]
-# Side-by-side bars
-bars_code = plt.bar(x - bar_width/2, df['code_change'], width=bar_width, color=code_colors, alpha=0.8, label='Δ Lines of Code (⬆️ green, ⬇️ blue)')
-bars_cplx = plt.bar(x + bar_width/2, df['complexity_change'], width=bar_width, color=cplx_colors, alpha=0.8, label='Δ Complexity (⬆️ red, ⬇️ orange)')
-# Spaced dates (1 in 7)
-step = max(1, len(df)//14)
-plt.xticks(x[::step], [d.strftime('%m-%d') for d in df['date']][::step], rotation=45, ha='right', fontsize=9)
-plt.title('Changes per Commit (lines of code & complexity)')
-plt.xlabel('Date')
-plt.ylabel('Variation')
-# Explicit legend
-from matplotlib.patches import Patch
-legend_elements = [
-    Patch(facecolor='#2ecc40', label='Lines of Code ↑ (green)'),
-    Patch(facecolor='#3498db', label='Lines of Code ↓ (blue)'),
-    Patch(facecolor='#e74c3c', label='Complexity ↑ (red)'),
-    Patch(facecolor='#f1c40f', label='Complexity ↓ (orange)')
-]
-plt.legend(handles=legend_elements)
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
 graph_path_changes = os.path.join(GRAPH_DIR, 'weekly_changes.png')
-plt.savefig(graph_path_changes)
-plt.close()
+if graph_is_current('weekly_changes.png', graph_fingerprints['weekly_changes.png']):
+    print('♻️ weekly_changes.png unchanged, reusing it')
+else:
+    plt.figure(figsize=(12,6))
+    bar_width = 0.4
+    x = np.arange(len(df_period))
+    # Dynamic colors based on sign
+    code_colors = ['#2ecc40' if v > 0 else '#3498db' for v in df_period['code_change']]
+    cplx_colors = ['#e74c3c' if v > 0 else '#f1c40f' for v in df_period['complexity_change']]
+    # Side-by-side bars
+    bars_code = plt.bar(x - bar_width/2, df_period['code_change'], width=bar_width, color=code_colors, alpha=0.8, label='Δ Lines of Code (⬆️ green, ⬇️ blue)')
+    bars_cplx = plt.bar(x + bar_width/2, df_period['complexity_change'], width=bar_width, color=cplx_colors, alpha=0.8, label='Δ Complexity (⬆️ red, ⬇️ orange)')
+    # Spaced dates (1 in 7)
+    step = max(1, len(df_period)//14)
+    plt.xticks(x[::step], [d.strftime('%m-%d') for d in df_period['date']][::step], rotation=45, ha='right', fontsize=9)
+    plt.title('Changes per Commit (lines of code & complexity)')
+    plt.xlabel('Date')
+    plt.ylabel('Variation')
+    # Explicit legend
+    from matplotlib.patches import Patch
+    legend_elements = [
+        Patch(facecolor='#2ecc40', label='Lines of Code ↑ (green)'),
+        Patch(facecolor='#3498db', label='Lines of Code ↓ (blue)'),
+        Patch(facecolor='#e74c3c', label='Complexity ↑ (red)'),
+        Patch(facecolor='#f1c40f', label='Complexity ↓ (orange)')
+    ]
+    plt.legend(handles=legend_elements)
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.savefig(graph_path_changes)
+    plt.close()
 
 # Top 3 commits (addition, deletion, complexity peak)
 top_add = df['code_change'].idxmax()
@@ -189,10 +309,10 @@ repo_link = f'\n🔗 [View analyzed repository]({repo_url})' if repo_url else ''
 summary = f"""
 {headline}{repo_link}
 
-**Period:** {week_ago.strftime('%d/%m/%Y')} → {now.strftime('%d/%m/%Y')}
+**Period:** {period_start.strftime('%d/%m/%Y')} → {now.strftime('%d/%m/%Y')}
 
 **Lines of Code:** {df_week['code'].iloc[-1] if len(df_week) else df['code'].iloc[-1]:,} {'🟩' if code_change > 0 else '🟥'} ({code_change:+,} {'⬆️' if code_change > 0 else '⬇️' if code_change < 0 else '➖'})
-**Dart Files:** {df_week['files'].iloc[-1] if len(df_week) else df['files'].iloc[-1]:,} {'🟦' if files_change > 0 else '🟥'} ({files_change:+,} {'⬆️' if files_change > 0 else '⬇️' if files_change < 0 else '➖'})
+**{SCC_LANGUAGE} Files:** {df_week['files'].iloc[-1] if len(df_week) else df['files'].iloc[-1]:,} {'🟦' if files_change > 0 else '🟥'} ({files_change:+,} {'⬆️' if files_change > 0 else '⬇️' if files_change < 0 else '➖'})
 **Complexity:** {df_week['complexity'].iloc[-1] if len(df_week) else df['complexity'].iloc[-1]:,} {'🟥' if complexity_change > 0 else '🟧'} ({complexity_change:+,} {'⬆️' if complexity_change > 0 else '⬇️' if complexity_change < 0 else '➖'})
 **Estimated Cost:** ${df_week['cost'].iloc[-1] if len(df_week) else df['cost'].iloc[-1]:,} {'💸' if cost_change > 0 else '💰'} ({cost_change:+,} {'⬆️' if cost_change > 0 else '⬇️' if cost_change < 0 else '➖'})
 
@@ -210,74 +330,47 @@ summary = f"""
 • Complexity: {avg_weekly_complexity:+,}
 
 ━━━━━━━━━━━━━━━━━━━━
-{top_summary}
+{modules_block}{top_summary}
 _Sent automatically by SCC Bot_
 """
 
 ratio_path = os.path.join(GRAPH_DIR, 'ratio_curves.png')
 
-# Calculate top-N files by LOC in Flutter project (if present)
+# Top-N files by lines of code in the newest analyzed commit (per-file totals written by the extractor)
+# Generated localization files are skipped to avoid noisy results
+TOP_FILES_SKIP_DIRS = {'l10n'}
+
 def compute_top_loc(top=10):
-    """Compute top-N files by code lines.
-    Restrict scan to the `lib/` directory when present and only count `.dart` files.
-    Ignore common generated/build directories to avoid noisy results (build, .dart_tool, test, etc.).
-    """
-    exts = ('.dart',)
-    candidates = [r"C:\\Users\\nrcoe\\Documents\\mytwip_mobile", "/c/Users/nrcoe/Documents/mytwip_mobile", os.path.join(os.path.dirname(__file__), '..')]
-    target = None
-    for c in candidates:
-        if os.path.exists(c):
-            target = c
-            break
-    if not target:
-        return [], None
-
-    # If there's a lib/ subdirectory, prefer it (we only want source files in lib/)
-    lib_dir = os.path.join(target, 'lib')
-    if os.path.isdir(lib_dir):
-        target = lib_dir
-
-    entries = []
-    skip_dirs = {'l10n', 'build', '.dart_tool', '.gradle', 'ios', 'android', 'test', '.git'}
-    for root, dirs, files in os.walk(target):
-        # mutate dirs in-place so os.walk won't descend into these
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        for fn in files:
-            if fn.endswith(exts):
-                path = os.path.join(root, fn)
-                try:
-                    total = code = comment = blank = 0
-                    with open(path, 'r', encoding='utf-8', errors='ignore') as fh:
-                        for line in fh:
-                            total += 1
-                            s = line.strip()
-                            if s == '':
-                                blank += 1
-                            elif s.startswith('//') or s.startswith('/*') or s.startswith('*'):
-                                comment += 1
-                            else:
-                                code += 1
-                    entries.append((path, total, code, comment, blank))
-                except Exception:
-                    continue
-    entries.sort(key=lambda x: x[2], reverse=True)
-    return entries[:top], target
-
-top_list, project_root = compute_top_loc(top=10)
+    """Return [(path, totals)] of the `top` files with the most lines of code, from latest_files.json."""
+    latest = load_json(os.path.join(REPORT_DIR, LATEST_FILES_FILE), {})
+    entries = [(path, totals) for path, totals in latest.items()
+               if not TOP_FILES_SKIP_DIRS.intersection(path.split('/')[:-1])]
+    entries.sort(key=lambda e: e[1].get('Code', 0), reverse=True)
+    return entries[:top]
+
+top_list = compute_top_loc(top=10)
 if top_list:
     lines = ['**Top 10 files (by Lines of Code):**']
-    for i, (p, total, code, comment, blank) in enumerate(top_list, start=1):
-        try:
-            rel = os.path.relpath(p, start=project_root)
-        except Exception:
-            rel = p
-        lines.append(f"{i}. `{rel}` — {code:,} lines (total {total:,}, comments {comment:,}, blank {blank:,})")
+    for i, (p, totals) in enumerate(top_list, start=1):
+        details = f"complexity {totals.get('Complexity', 0):,}"
+        if 'Lines' in totals:
+            details = f"total {totals['Lines']:,}, comments {totals.get('Comment', 0):,}, blank {totals.get('Blank', 0):,}, " + details
+        lines.append(f"{i}. `{p}` — {totals.get('Code', 0):,} lines ({details})")
     top_block = "\n".join(lines)
     # store the block to add later (embed_ratio not yet defined)
     # limit size to stay under Discord embed limit (~4096 chars)
     if len(top_block) > 3700:
         top_block = top_block[:3690] + '\n...'
 
+# Hotspots: recent churn (from the git log --numstat pass) x complexity of the newest analyzed commit
+hotspots = compute_hotspots(REPORT_DIR, top=10)
+hotspot_block = ''
+if hotspots:
+    lines = [f'**Hotspots (churn over {CHURN_RECENT_DAYS} days × complexity):**']
+    for i, (p, score, churn, n_commits, cplx, code) in enumerate(hotspots, start=1):
+        lines.append(f"{i}. `{p}` — {churn:,} lines churned in {n_commits} commits, complexity {cplx:,} ({code:,} lines)")
+    hotspot_block = "\n".join(lines)
+
 # Prepare two embeds: 1) summary + weekly_changes.png  2) normalized curves (ratio_curves.png)
 embed_main = {
     "title": "✨ Weekly SCC Report ✨",
@@ -295,15 +388,16 @@ embed_ratio = {
 }
 
 # If we calculated a top_block above, add it now to the description
-try:
-    if top_list:
-        desc = embed_ratio.get('description', '') + '\n\n' + top_block
-        if len(desc) > 3800:
-            desc = desc[:3790] + '\n...'
-        embed_ratio['description'] = desc
-except NameError:
-    # top_list/top_block not defined: nothing to do
-    pass
+if top_list:
+    desc = embed_ratio.get('description', '') + '\n\n' + top_block
+    if len(desc) > 3800:
+        desc = desc[:3790] + '\n...'
+    embed_ratio['description'] = desc
+if hotspot_block:
+    desc = embed_ratio.get('description', '') + '\n\n' + hotspot_block
+    if len(desc) > 3800:
+        desc = desc[:3790] + '\n...'
+    embed_ratio['description'] = desc
 
 payload = {"embeds": [embed_main, embed_ratio], "username": WEBHOOK_USERNAME, "avatar_url": WEBHOOK_AVATAR_URL}
 
@@ -348,6 +442,19 @@ try:
     print('Discord response:', resp.status_code, resp.text)
     if resp.status_code in (200, 204):
         print('✅ Report sent to Discord! (with attachments if present)')
+        # Persist what was sent so the next run only reports the delta (and skips when nothing changed)
+        atomic_write_json(REPORT_STATE_FILE, {
+            'sent_at': now.isoformat(timespec='seconds'),
+            'last_report': latest_report,
+            'last_commit_date': df['date'].iloc[-1].isoformat(),
+            'totals': {col: df[col].iloc[-1].item() for col in ('code', 'files', 'complexity', 'cost')},
+            'modules': {m: [int(r['code']), int(r['complexity'])] for m, r in current_modules.iterrows()}
+            if not module_df.empty else {},
+            'graphs': {
+                os.path.basename(p): {'data': graph_fingerprints[os.path.basename(p)], 'sha256': file_sha256(p)}
+                for p in (graph_path, graph_path_changes)
+            }
+        })
     else:
         print(f'Discord error: {resp.status_code} {resp.text}')
 finally: